@@ -0,0 +1,238 @@
+"""
+Мікробенчмарки гарячих шляхів дошки і кадру. Працюють без вікна
+(SDL dummy), результати – JSON, який можна порівняти з попереднім запуском.
+
+    python -m benchmarks.board --output before.json
+    ... зміни в game/board.py ...
+    python -m benchmarks.board --output after.json --compare before.json
+
+З --compare скрипт позначає бенчмарки, що сповільнились більше ніж
+на --threshold (за замовчуванням 10 %), і завершується з кодом 1.
+"""
+
+import os
+
+# до імпорту pygame: жодного вікна, жодного звуку
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import pygame
+
+from game.board import Board
+
+# позиція для бенчмарків: MIDGAME_MOVES випадкових ходів від старту (seed фіксований)
+MIDGAME_MOVES = 10
+SEED = 12345
+
+
+def _midgame_board() -> Board:
+    board = Board()
+    rng = random.Random(SEED)
+    for _ in range(MIDGAME_MOVES):
+        jumps = board.position.legal_jumps()
+        if not jumps:
+            break
+        board._make_move(board._move_from_jump(rng.choice(jumps)))
+    return board
+
+
+def _movable_peg(board: Board):
+    j = board.position.legal_jumps()[0]
+    sr, sc = board._move_from_jump(j)["source"]
+    return board.cells[sr][sc]
+
+
+# --- бенчмарки: кожен повертає функцію без аргументів, яку заміряємо --- #
+
+def bench_get_valid_moves():
+    board = _midgame_board()
+    peg = _movable_peg(board)
+    return lambda: board._get_valid_moves(peg)
+
+
+def bench_has_valid_moves():
+    board = _midgame_board()
+    return board.has_valid_moves
+
+
+def bench_get_peg_count():
+    board = _midgame_board()
+    return board.get_peg_count
+
+
+def bench_show_best_hint():
+    board = _midgame_board()
+    random.seed(SEED)
+    return board._show_best_hint
+
+
+def bench_make_undo_move():
+    board = _midgame_board()
+    move = board._move_from_jump(board.position.legal_jumps()[0])
+
+    def round_trip():
+        board._make_move(move)
+        board.undo_move()
+
+    return round_trip
+
+
+def _game():
+    from main import Game
+
+    game = Game(session_path=None)
+    game.board = _midgame_board()
+    game._update()
+    game._draw()
+    return game
+
+
+def bench_draw_full_frame():
+    game = _game()
+
+    def frame():
+        game.renderer.invalidate()
+        game._draw()
+
+    return frame
+
+
+def bench_draw_idle_frame():
+    game = _game()
+    return game._draw
+
+
+def bench_draw_select_frame():
+    """Кадр після вибору фішки і зняття вибору: перемальовуються лише змінені клітинки."""
+    game = _game()
+    peg = _movable_peg(game.board)
+
+    def frame():
+        game.board._handle_peg_click(peg)
+        game._draw()
+
+    return frame
+
+
+BENCHMARKS = {
+    "board.get_valid_moves": bench_get_valid_moves,
+    "board.has_valid_moves": bench_has_valid_moves,
+    "board.get_peg_count": bench_get_peg_count,
+    "board.show_best_hint": bench_show_best_hint,
+    "board.make_undo_move": bench_make_undo_move,
+    "game.draw_full_frame": bench_draw_full_frame,
+    "game.draw_idle_frame": bench_draw_idle_frame,
+    "game.draw_select_frame": bench_draw_select_frame,
+}
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """Час одного виклику (мкс): найкращий і медіана з repeat замірів."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    loops = max(1, int(loops * min_time / 0.2))
+    runs = [t / loops * 1e6 for t in timer.repeat(repeat, loops)]
+    return {
+        "best_us": round(min(runs), 3),
+        "median_us": round(statistics.median(runs), 3),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(names: list[str], repeat: int = 5, min_time: float = 0.2) -> dict:
+    results = {}
+    for name in names:
+        fn = BENCHMARKS[name]()
+        results[name] = measure(fn, repeat, min_time)
+        print(f"  {name:<28} {results[name]['best_us']:>12.2f} мкс")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Друкує таблицю порівняння, повертає назви бенчмарків, що сповільнились."""
+    regressions = []
+    print(f"\n{'бенчмарк':<28} {'було, мкс':>12} {'стало, мкс':>12} {'зміна':>8}")
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<28} {'—':>12} {result['best_us']:>12.2f}")
+            continue
+        ratio = result["best_us"] / base["best_us"] if base["best_us"] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠ повільніше"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  ✓ швидше"
+        print(
+            f"{name:<28} {base['best_us']:>12.2f} {result['best_us']:>12.2f}"
+            f" {(ratio - 1) * 100:>+7.1f}%{flag}"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарки дошки і кадру (без вікна)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="лише ці бенчмарки")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="секунд на один замір")
+    parser.add_argument("--output", help="куди записати JSON з результатами")
+    parser.add_argument("--compare", help="JSON попереднього запуску для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.10, help="допустиме сповільнення (частка)")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    report = run(names, args.repeat, args.min_time)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n⚠ Сповільнились: {', '.join(regressions)}")
+            sys.exit(1)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Генератор навантаження для сервера партій (game.server).
+
+    python -m game.server --port 7777 &
+    python -m benchmarks.loadgen --port 7777 --connections 50 --sessions 40 --duration 10
+
+Кожне з'єднання тримає --sessions сесій; кожна сесія – замкнений цикл
+«запит – відповідь – наступний запит»: легальний хід (MOVE або два
+CLICK), зрідка UNDO і HINT (--hint-ratio). Партія без ходів
+починається наново (CLOSE + NEW). Наприкінці – запитів за секунду і
+p50/p95/p99 затримки (мс) за типом запиту; --output – те саме в JSON.
+--spawn запускає сервер окремим процесом на час заміру.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from game.geometries import DEFAULT_GEOMETRY
+from game.profiler import percentile
+from game.protocol import (
+    OP_CLICK,
+    OP_CLOSE,
+    OP_HINT,
+    OP_MOVE,
+    OP_NAMES,
+    OP_NEW,
+    OP_UNDO,
+    RESPONSE,
+    STATUS_OK,
+    encode_request,
+)
+
+# частки запитів (решта до 1 після HINT – MOVE)
+CLICK_RATIO = 0.2
+UNDO_RATIO = 0.05
+
+
+class _Connection:
+    """Одне з'єднання: відповіді зіставляються з запитами за request_id."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.pending: dict[int, asyncio.Future] = {}
+        self.next_id = 1
+        self._reader_task = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                data = await self.reader.readexactly(RESPONSE.size)
+                response = RESPONSE.unpack(data)
+                future = self.pending.pop(response[0], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(e))
+
+    async def request(self, op: int, session: int = 0, a: int = 0, b: int = 0) -> tuple:
+        request_id = self.next_id
+        self.next_id = (self.next_id + 1) & 0xFFFFFFFF or 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(encode_request(op, request_id, session, a, b))
+        return await future
+
+    async def close(self) -> None:
+        self.writer.close()
+        self._reader_task.cancel()
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        unix: str | None,
+        connections: int,
+        sessions: int,
+        duration: float,
+        hint_ratio: float,
+        seed: int | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.unix = unix
+        self.connections = connections
+        self.sessions = sessions
+        self.duration = duration
+        self.hint_ratio = hint_ratio
+        self.rng = random.Random(seed)
+        self.geometry = DEFAULT_GEOMETRY
+        # op -> затримки, мс
+        self.latencies: dict[int, list[float]] = {op: [] for op in OP_NAMES}
+        self.errors = 0
+        self._deadline = 0.0
+
+    async def _timed(self, conn: _Connection, op: int, session: int = 0, a: int = 0, b: int = 0) -> tuple:
+        started = time.perf_counter()
+        response = await conn.request(op, session, a, b)
+        self.latencies[op].append((time.perf_counter() - started) * 1000)
+        if response[2] != STATUS_OK:
+            self.errors += 1
+        return response
+
+    async def _session_loop(self, conn: _Connection) -> None:
+        g = self.geometry
+        rng = self.rng
+        _, session, _, bits, _ = await self._timed(conn, OP_NEW)
+        while time.perf_counter() < self._deadline:
+            jumps = g.legal_jumps(bits)
+            if not jumps:
+                await self._timed(conn, OP_CLOSE, session)
+                _, session, _, bits, _ = await self._timed(conn, OP_NEW)
+                continue
+
+            roll = rng.random()
+            if roll < self.hint_ratio:
+                await self._timed(conn, OP_HINT, session)
+            elif roll < self.hint_ratio + UNDO_RATIO:
+                bits = (await self._timed(conn, OP_UNDO, session))[3]
+            elif roll < self.hint_ratio + UNDO_RATIO + CLICK_RATIO:
+                s, _, t = g.jump_cells[rng.choice(jumps)]
+                await self._timed(conn, OP_CLICK, session, *g.cells[s])
+                bits = (await self._timed(conn, OP_CLICK, session, *g.cells[t]))[3]
+            else:
+                bits = (await self._timed(conn, OP_MOVE, session, rng.choice(jumps)))[3]
+
+    async def _connection_loop(self) -> None:
+        if self.unix:
+            reader, writer = await asyncio.open_unix_connection(self.unix)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = _Connection(reader, writer)
+        try:
+            await asyncio.gather(*(self._session_loop(conn) for _ in range(self.sessions)))
+        finally:
+            await conn.close()
+
+    async def run(self) -> dict:
+        started = time.perf_counter()
+        self._deadline = started + self.duration
+        await asyncio.gather(*(self._connection_loop() for _ in range(self.connections)))
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> dict:
+        total = sum(len(v) for v in self.latencies.values())
+        ops = {}
+        for op, values in self.latencies.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            ops[OP_NAMES[op]] = {
+                "count": len(values),
+                "p50_ms": round(percentile(ordered, 50), 3),
+                "p95_ms": round(percentile(ordered, 95), 3),
+                "p99_ms": round(percentile(ordered, 99), 3),
+            }
+        return {
+            "connections": self.connections,
+            "sessions": self.connections * self.sessions,
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "requests_per_s": round(total / elapsed, 1) if elapsed else 0.0,
+            "errors": self.errors,
+            "ops": ops,
+        }
+
+
+def _spawn_server(host: str, port: int, unix: str | None) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "game.server", "--host", host, "--port", str(port)]
+    if unix:
+        cmd += ["--unix", unix]
+    proc = subprocess.Popen(cmd)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if unix:
+                with socket.socket(socket.AF_UNIX) as s:
+                    s.connect(unix)
+            else:
+                socket.create_connection((host, port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("Сервер не запустився")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Навантаження для сервера партій")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="Unix-сокет замість TCP")
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=50, help="сесій на з'єднання")
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд")
+    parser.add_argument("--hint-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--spawn", action="store_true", help="запустити сервер на час заміру")
+    parser.add_argument("--output", help="куди записати JSON з результатами")
+    args = parser.parse_args(argv)
+
+    server = _spawn_server(args.host, args.port, args.unix) if args.spawn else None
+    try:
+        generator = LoadGenerator(
+            args.host,
+            args.port,
+            args.unix,
+            args.connections,
+            args.sessions,
+            args.duration,
+            args.hint_ratio,
+            args.seed,
+        )
+        report = asyncio.run(generator.run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(
+        f"{report['requests']:,} запитів за {report['duration_s']} с: "
+        f"{report['requests_per_s']:,.0f} за секунду, {report['sessions']:,} сесій, "
+        f"помилок {report['errors']}"
+    )
+    print(f"\n{'запит':<8} {'кількість':>10} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9}")
+    for name, stats in report["ops"].items():
+        print(
+            f"{name:<8} {stats['count']:>10,} {stats['p50_ms']:>9.2f}"
+            f" {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
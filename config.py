@@ -5,12 +5,18 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
 FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+DATA_DIR = os.path.join(BASE_DIR, "data")
 
 # Розміри вікна
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Простій: без вводу цикл спить у pygame.event.wait (мс)
+IDLE_WAIT = 1000
+# скільки після останнього вводу ще працювати на повному FPS (мс)
+ACTIVE_LINGER = 500
+
 # Кольори
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -21,7 +27,8 @@ BLUE = (0, 100, 255)
 RED = (255, 0, 0)
 GREEN = (0, 200, 0)
 
-# Налаштування дошки
+# Налаштування дошки (сітка англійської дошки; для інших геометрій
+# Board рахує відступи від розміру маски)
 BOARD_ROWS = 7
 BOARD_COLS = 7
 CELL_SIZE = 50
@@ -42,6 +49,9 @@ PEG_DIAMETER = PEG_RADIUS * 2
 HOLE_DIAMETER = int(PEG_DIAMETER * 0.75)     # ≈ 46 px при CELL_SIZE=50
 # Отвір трохи більший за кульку, але не занадто
 
+# Зелена підсвітка отвору для можливого ходу
+HOLE_HINT_DIAMETER = int(HOLE_DIAMETER * 1.55)
+
 # Ігрові стани
 STATE_PLAYING = "playing"
 STATE_MENU = "menu"
@@ -50,6 +60,39 @@ STATE_GAME_OVER = "game_over"
 # Затримка для автопідказки (мс)
 HINT_DELAY = 30000
 
+# Бюджет пошуку підказки в процесі-воркері (вузлів); далі – евристика
+HINT_SEARCH_NODES = 300_000
+# пріоритет процесу підказок (os.nice): нижчий за GUI
+HINT_WORKER_NICE = 10
+
+# Сервер партій (python -m game.server)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7777
+# підказки збираються в пакет щонайбільше стільки мс або до стільки позицій
+SERVER_HINT_BATCH_MS = 5
+SERVER_HINT_BATCH_SIZE = 512
+SERVER_MAX_SESSIONS = 100_000
+
+# Розв'язувач для Board.find_solution: "dfs" – пошук у глибину (game.solver),
+# "bidirectional" – назустріч від цілі (game.bidirectional)
+SOLVER_MODE = "dfs"
+
+# Таблиця виграшних позицій (будується: python -m game.windb)
+WIN_DB_PATH = os.path.join(DATA_DIR, "english.windb")
+
+# Задачі з гарантованим розв'язком (генеруються: python -m game.puzzles)
+PUZZLES_PATH = os.path.join(DATA_DIR, "puzzles.jsonl")
+
+# Упаковані текстури для швидкого старту (будується: python -m game.assets)
+ASSET_CACHE_PATH = os.path.join(DATA_DIR, "assets.cache")
+
+# Атлас спрайтів у розмірах екрана (будується: python -m game.atlas)
+ATLAS_PATH = os.path.join(DATA_DIR, "atlas.png")
+ATLAS_MANIFEST_PATH = os.path.join(DATA_DIR, "atlas.json")
+
+# Автозбереження поточної партії
+SESSION_PATH = os.path.join(DATA_DIR, "session.bin")
+
 # Шляхи до картинок
 IMAGE_PATHS = {
     # дошка
@@ -68,7 +111,7 @@ IMAGE_PATHS = {
     # кнопки
     "button_restart": os.path.join(IMAGES_DIR, "Button(restart).png"),
     "button_undo": os.path.join(IMAGES_DIR, "Button(undo).png"),
-    "button_exit": os.path.join(IMAGES_DIR, "Button(Exit).png"),
+    "button_exit": os.path.join(IMAGES_DIR, "Button(exit).png"),
     "button_restart_pressed": os.path.join(IMAGES_DIR, "Button_pressed (Restart).png"),
     "button_undo_pressed": os.path.join(IMAGES_DIR, "Button_pressed (Undo).png"),
     "button_exit_pressed": os.path.join(IMAGES_DIR, "Button_pressed (Exit).png"),
@@ -97,7 +140,28 @@ BUTTON_POSITIONS = {
     "exit": (start_x + 2 * (BUTTON_WIDTH + BUTTON_SPACING), BUTTON_Y),
 }
 
-# Маска дошки у формі хреста
+# Область лічильників зверху зліва (перемальовується лише при зміні)
+HUD_RECT = (10, 10, 260, 85)
+# Напис «H – підказка» / «Думаю…» знизу зліва
+HINT_LABEL_RECT = (10, SCREEN_HEIGHT - 40, 260, 35)
+# Попередження «партію вже не виграти» зверху справа
+LOST_LABEL_RECT = (SCREEN_WIDTH - 330, 10, 320, 60)
+
+# Скільки відрендерених рядків тексту тримати в кеші (game.text_cache)
+TEXT_CACHE_SIZE = 128
+
+# Профайлер кадру: оверлей (F3) справа від дошки
+PROFILER_RECT = (SCREEN_WIDTH - 215, 100, 205, 190)
+# скільки останніх кадрів тримати для графіка і перцентилів
+PROFILE_HISTORY = 240
+# як часто експортувати перцентилі (--profile-export), мс
+PROFILE_EXPORT_INTERVAL = 5000
+
+# Геометрія дошки: english, french, german, diamond, triangular
+# або "custom" – тоді береться BOARD_MASK нижче
+BOARD_GEOMETRY = "english"
+
+# Маска дошки у формі хреста (для BOARD_GEOMETRY = "custom")
 BOARD_MASK = [
     [0, 0, 1, 1, 1, 0, 0],
     [0, 0, 1, 1, 1, 0, 0],
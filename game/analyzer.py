@@ -0,0 +1,373 @@
+"""
+Аналіз архівів зіграних партій.
+
+Архів – файл (можна .gz) із записами MoveHistory.to_bytes() підряд або
+тека з такими файлами. Усе читається потоково: генератори видають по
+одному запису, тож пам'ять не залежить від розміру корпусу. Обрізаний
+чи пошкоджений запис зупиняє лише свій файл.
+
+Для кожної партії позиції відтворюються прямо на бітових масках і
+шукається «помилка» – хід, після якого ще виграшна позиція стала
+програшною. Виграшність уздовж партії монотонна (програш не минає),
+тож хід знаходиться двійковим пошуком за O(log n) перевірок.
+Перевірка – таблиця виграшних позицій (для партій від стандартного
+старту), інакше BidirectionalSolver.
+
+Підсумок: теплова карта помилок за клітинкою, з якої ходила фішка,
+розподіл кількості фішок наприкінці і номерів ходів-помилок.
+
+    python -m game.analyzer archive/ --workers 8 --json report.json
+
+З --workers > 1 пакети записів ідуть на ProcessPoolExecutor; у польоті
+не більше двох пакетів на воркер, тож читання не випереджає аналіз.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import zlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config import *
+from game.bidirectional import BidirectionalSolver
+from game.geometries import get_geometry
+from game.history import MoveHistory, read_record
+from game.position import Geometry
+from game.windb import WinDatabase
+
+# записів в одному завданні пулу
+BATCH_SIZE = 256
+
+# таблиця програшних позицій розв'язувача очищається, коли стає більшою
+MAX_DEAD = 2_000_000
+
+
+# --- потік записів --- #
+
+def iter_paths(paths: list[str]):
+    """Файли архівів: теки обходяться рекурсивно, у відсортованому порядку."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_records(paths):
+    """
+    Сирі записи історії з усіх архівів, по одному. На пошкодженому записі
+    решта файлу пропускається з попередженням, і читання йде далі.
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        count = 0
+        with opener(path, "rb") as f:
+            while True:
+                try:
+                    record = read_record(f)
+                except (ValueError, EOFError, gzip.BadGzipFile, zlib.error) as e:
+                    print(f"⚠ {path}: після {count} записів – {e}; решту файлу пропущено")
+                    break
+                if record is None:
+                    break
+                count += 1
+                yield record
+
+
+def iter_batches(records, size: int = BATCH_SIZE):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- одна партія --- #
+
+class _Oracle:
+    """Чи ще виграшна позиція: таблиця (якщо підходить) або розв'язувач."""
+
+    def __init__(self, geometry: Geometry, goal: tuple[int, int] | None) -> None:
+        self.geometry = geometry
+        self.db = None
+        if os.path.exists(WIN_DB_PATH):
+            try:
+                db = WinDatabase(WIN_DB_PATH, geometry)
+            except (OSError, ValueError):
+                db = None
+            if db is not None and db.goal == goal:
+                self.db = db
+        self.solver = BidirectionalSolver(geometry, goal)
+
+    def is_winnable(self, bits: int, from_start: bool) -> bool:
+        # у таблиці лише позиції, досяжні зі стандартного старту
+        if from_start and self.db is not None:
+            return self.db.is_winnable(bits)
+        if len(self.solver.dead) > MAX_DEAD:
+            self.solver.dead.clear()
+        return self.solver.is_solvable(bits)
+
+
+# (назва геометрії, ціль) -> _Oracle; свій набір у кожному процесі
+_oracles: dict[tuple[str, tuple[int, int] | None], _Oracle] = {}
+
+
+def _get_oracle(geometry: Geometry, goal: tuple[int, int] | None) -> _Oracle:
+    oracle = _oracles.get((geometry.name, goal))
+    if oracle is None:
+        oracle = _oracles[(geometry.name, goal)] = _Oracle(geometry, goal)
+    return oracle
+
+
+def replay(history: MoveHistory) -> list[int]:
+    """Позиції партії від старту; ValueError, якщо в записі нелегальний хід."""
+    checks = history.geometry.jump_checks
+    bits = history.start_bits
+    positions = [bits]
+    for j in history:
+        need, target, flip = checks[j]
+        if bits & need != need or bits & target:
+            raise ValueError(f"Нелегальний хід {len(positions)}")
+        bits ^= flip
+        positions.append(bits)
+    return positions
+
+
+def classify(history: MoveHistory, goal: tuple[int, int] | None) -> tuple[str, int | None]:
+    """
+    Підсумок партії і номер ходу-помилки (від 0; лише для "blunder"):
+    "won" – дійшли до цілі, "unfinished" – остання позиція ще виграшна
+    (партію покинули), "lost_from_start" – програшна від початку,
+    "blunder" – хід, після якого виграшна позиція стала програшною.
+    """
+    g = history.geometry
+    positions = replay(history)
+    final = positions[-1]
+    if final & (final - 1) == 0 and (goal is None or final == 1 << g.index[goal]):
+        return "won", None
+
+    oracle = _get_oracle(g, goal)
+    from_start = history.start_bits == g.start_bits()
+    if not oracle.is_winnable(positions[0], from_start):
+        return "lost_from_start", None
+    if oracle.is_winnable(final, from_start):
+        return "unfinished", None
+
+    # positions[lo] виграшна, positions[hi] програшна
+    lo, hi = 0, len(positions) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if oracle.is_winnable(positions[mid], from_start):
+            lo = mid
+        else:
+            hi = mid
+    return "blunder", lo
+
+
+def find_blunder(history: MoveHistory, goal: tuple[int, int] | None) -> int | None:
+    """
+    Номер ходу (від 0), після якого виграшна позиція стала програшною.
+    None – партія виграна, не дограна з виграшної позиції або програшна
+    від початку.
+    """
+    return classify(history, goal)[1]
+
+
+# --- статистика --- #
+
+class Stats:
+    """Підсумки по партіях однієї геометрії; складаються через merge()."""
+
+    def __init__(self, geometry_name: str) -> None:
+        self.geometry_name = geometry_name
+        self.games = 0
+        self.won = 0
+        self.blunders = 0
+        self.lost_from_start = 0
+        # покинуті партії, остання позиція яких ще виграшна
+        self.unfinished = 0
+        # записи з нелегальними ходами (пошкоджений архів)
+        self.invalid = 0
+        # (рядок, стовпець) клітинки, з якої ходила фішка -> кількість помилок
+        self.heatmap: Counter = Counter()
+        self.final_pegs: Counter = Counter()
+        self.blunder_moves: Counter = Counter()
+
+    def add(self, history: MoveHistory, goal: tuple[int, int] | None) -> None:
+        g = history.geometry
+        try:
+            outcome, blunder = classify(history, goal)
+        except ValueError:
+            self.invalid += 1
+            return
+
+        self.games += 1
+        self.final_pegs[history.bits_at(len(history)).bit_count()] += 1
+        if outcome == "blunder":
+            self.blunders += 1
+            self.blunder_moves[blunder + 1] += 1
+            self.heatmap[g.cells[g.jump_cells[history[blunder]][0]]] += 1
+        elif outcome == "won":
+            self.won += 1
+        elif outcome == "unfinished":
+            self.unfinished += 1
+        else:
+            self.lost_from_start += 1
+
+    def merge(self, other: "Stats") -> None:
+        self.games += other.games
+        self.won += other.won
+        self.blunders += other.blunders
+        self.lost_from_start += other.lost_from_start
+        self.unfinished += other.unfinished
+        self.invalid += other.invalid
+        self.heatmap.update(other.heatmap)
+        self.final_pegs.update(other.final_pegs)
+        self.blunder_moves.update(other.blunder_moves)
+
+    def to_dict(self) -> dict:
+        return {
+            "geometry": self.geometry_name,
+            "games": self.games,
+            "won": self.won,
+            "blunders": self.blunders,
+            "lost_from_start": self.lost_from_start,
+            "unfinished": self.unfinished,
+            "invalid": self.invalid,
+            "heatmap": {f"{r},{c}": n for (r, c), n in sorted(self.heatmap.items())},
+            "final_pegs": dict(sorted(self.final_pegs.items())),
+            "blunder_moves": dict(sorted(self.blunder_moves.items())),
+        }
+
+    def format(self) -> str:
+        g = get_geometry(self.geometry_name)
+        lines = [
+            f"{self.geometry_name}: партій {self.games:,}, виграно {self.won:,}, "
+            f"помилок {self.blunders:,}, програшних від старту {self.lost_from_start:,}, "
+            f"недограних {self.unfinished:,}, "
+            f"пошкоджених записів {self.invalid:,}",
+            "",
+            "Помилки за клітинкою, з якої ходила фішка:",
+        ]
+        width = max([len(str(n)) for n in self.heatmap.values()] + [1])
+        for r in range(g.rows):
+            row = []
+            for c in range(g.cols):
+                if (r, c) in g.index:
+                    row.append(str(self.heatmap.get((r, c), 0)).rjust(width))
+                else:
+                    row.append(" " * width)
+            lines.append("  " + " ".join(row))
+
+        lines += ["", "Фішок наприкінці:"]
+        most = max(self.final_pegs.values(), default=0)
+        for pegs, n in sorted(self.final_pegs.items()):
+            bar = "█" * max(1, round(n / most * 40)) if most else ""
+            lines.append(f"  {pegs:>2}  {n:>10,}  {bar}")
+        return "\n".join(lines)
+
+
+def _record_geometry_name(record: bytes) -> str | None:
+    try:
+        name = record[6:6 + record[5]].decode()
+        get_geometry(name)
+    except (IndexError, ValueError, KeyError):
+        return None
+    return name
+
+
+def analyze_batch(records: list[bytes], center: bool = False) -> dict[str, Stats]:
+    """Статистика пакета записів за назвою геометрії."""
+    result: dict[str, Stats] = {}
+    for record in records:
+        try:
+            history = MoveHistory.from_bytes(record)
+        except ValueError:
+            # пошкоджений запис рахується за дошкою із заголовка, якщо вона відома
+            name = _record_geometry_name(record)
+            if name is not None:
+                if name not in result:
+                    result[name] = Stats(name)
+                result[name].invalid += 1
+            continue
+        g = history.geometry
+        goal = g.center if center else None
+        stats = result.get(g.name)
+        if stats is None:
+            stats = result[g.name] = Stats(g.name)
+        stats.add(history, goal)
+    return result
+
+
+def _merge(total: dict[str, Stats], part: dict[str, Stats]) -> None:
+    for name, stats in part.items():
+        if name in total:
+            total[name].merge(stats)
+        else:
+            total[name] = stats
+
+
+def analyze(
+    paths: list[str],
+    center: bool = False,
+    workers: int = 1,
+    batch_size: int = BATCH_SIZE,
+) -> dict[str, Stats]:
+    batches = iter_batches(iter_records(iter_paths(paths)), batch_size)
+    total: dict[str, Stats] = {}
+    if workers <= 1:
+        for batch in batches:
+            _merge(total, analyze_batch(batch, center))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for batch in batches:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _merge(total, future.result())
+            pending.add(executor.submit(analyze_batch, batch, center))
+        for future in wait(pending).done:
+            _merge(total, future.result())
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Аналіз архівів партій: помилки і підсумки")
+    parser.add_argument("paths", nargs="+", help="файли архівів (.gz теж) або теки")
+    parser.add_argument(
+        "--center",
+        action="store_true",
+        help="виграш – лише остання фішка в центрі",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="процесів для аналізу")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--json", help="куди записати підсумки у JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.paths, args.center, args.workers, args.batch_size)
+    if not report:
+        print("Партій не знайдено")
+        return
+
+    for stats in report.values():
+        print(stats.format())
+        print()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([s.to_dict() for s in report.values()], f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
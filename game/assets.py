@@ -0,0 +1,249 @@
+"""
+Ліниве завантаження зображень і кеш масштабованих копій.
+
+- текстура читається з диска лише при першому зверненні
+- шляхи з IMAGE_PATHS один раз звіряються з вмістом папки з урахуванням
+  регістру (на Linux "Button(Exit).png" і "Button(exit).png" – різні файли)
+- за наявності startup-кешу (python -m game.assets) усі текстури лежать
+  в одному файлі сирими RGBA-байтами: без декодування PNG на старті
+- за наявності атласу (python -m game.atlas) спрайти фішок, отворів і кнопок
+  беруться з нього як (поверхня атласу, прямокутник) – див. sprite()
+- enabled=False (--no-assets) – жодних файлів, малюються векторні заглушки
+"""
+
+import json
+import os
+import struct
+
+import pygame
+
+import config
+from config import *
+from game.atlas import TextureAtlas
+
+CACHE_MAGIC = b"PEGASSET"
+
+
+class AssetCache:
+    """
+    Зображення за ключами з IMAGE_PATHS + масштабовані копії за ключем
+    (назва, розмір). Масштабовані копії скидаються лише тоді, коли
+    змінюється CELL_SIZE або розмір вікна.
+    """
+
+    def __init__(
+        self,
+        paths: dict[str, str] = IMAGE_PATHS,
+        enabled: bool = True,
+        cache_path: str | None = ASSET_CACHE_PATH,
+        atlas_paths: tuple[str, str] | None = (ATLAS_PATH, ATLAS_MANIFEST_PATH),
+    ) -> None:
+        self.paths = dict(paths) if enabled else {}
+        self.images: dict[str, pygame.Surface] = {}
+        self._missing: set[str] = set()
+        self._dir_listing: dict[str, set[str]] = {}
+
+        self._scaled: dict[tuple[str, tuple[int, int]], pygame.Surface] = {}
+        self._layout_key: tuple | None = None
+
+        # key -> (байти RGBA, розмір) зі startup-кешу
+        self._packed: dict[str, tuple[memoryview, tuple[int, int]]] = {}
+        if enabled and cache_path:
+            self._open_cache(cache_path)
+
+        # атлас відкривається при першому sprite()
+        self._atlas_paths = atlas_paths if enabled else None
+        self.atlas: TextureAtlas | None = None
+
+    # --- startup-кеш --- #
+
+    def _open_cache(self, cache_path: str) -> None:
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+
+        packed = {}
+        try:
+            if data[:8] != CACHE_MAGIC:
+                raise ValueError("невідомий формат")
+            (header_len,) = struct.unpack_from("<I", data, 8)
+            header = json.loads(data[12:12 + header_len])
+            blob = memoryview(data)[12 + header_len:]
+
+            for key, entry in header.items():
+                path = self.paths.get(key)
+                resolved = self._resolve_path(path) if path else None
+                # кеш дійсний лише для того самого файлу тієї самої версії
+                if resolved is None or entry["source"] != _source_stamp(resolved):
+                    continue
+                start, length = entry["offset"], entry["length"]
+                packed[key] = (blob[start:start + length], tuple(entry["size"]))
+        except (ValueError, struct.error, KeyError, TypeError, AttributeError) as e:
+            # зіпсований кеш – вантажимо текстури ліниво, як без нього
+            print(f"⚠ Кеш текстур {cache_path} пропущено: {e!r}")
+            return
+        self._packed.update(packed)
+
+    def _open_atlas(self) -> None:
+        image_path, manifest_path = self._atlas_paths
+        self._atlas_paths = None
+        self.atlas = TextureAtlas.load(image_path, manifest_path, self._is_fresh)
+
+    def _is_fresh(self, key: str, source) -> bool:
+        path = self.paths.get(key)
+        resolved = self._resolve_path(path) if path else None
+        return resolved is not None and source == _source_stamp(resolved)
+
+    # --- завантаження --- #
+
+    def _resolve_path(self, path: str) -> str | None:
+        """Звірка назви файлу з папкою (один listdir на папку)."""
+        folder, name = os.path.split(path)
+        names = self._dir_listing.get(folder)
+        if names is None:
+            try:
+                names = set(os.listdir(folder))
+            except OSError:
+                names = set()
+            self._dir_listing[folder] = names
+
+        if name in names:
+            return path
+
+        lowered = name.lower()
+        for candidate in names:
+            if candidate.lower() == lowered:
+                print(f"⚠ {name}: на диску файл називається {candidate} – виправте IMAGE_PATHS")
+                return os.path.join(folder, candidate)
+        return None
+
+    def _load(self, key: str) -> pygame.Surface | None:
+        packed = self._packed.pop(key, None)
+        if packed is not None:
+            raw, size = packed
+            img = pygame.image.frombuffer(raw, size, "RGBA").convert_alpha()
+            self.images[key] = img
+            return img
+
+        path = self.paths.get(key)
+        if path is None:
+            self._missing.add(key)
+            return None
+
+        resolved = self._resolve_path(path)
+        if resolved is None:
+            print(f"⚠ Не вдалось завантажити {path}: файлу немає")
+            self._missing.add(key)
+            return None
+
+        try:
+            img = pygame.image.load(resolved).convert_alpha()
+        except (pygame.error, OSError) as e:
+            print(f"⚠ Не вдалось завантажити {path}: {e}")
+            self._missing.add(key)
+            return None
+
+        self.images[key] = img
+        return img
+
+    # --- доступ --- #
+
+    def get(self, key: str, default=None) -> pygame.Surface | None:
+        img = self.images.get(key)
+        if img is None and key not in self._missing:
+            img = self._load(key)
+        return default if img is None else img
+
+    def __contains__(self, key: str) -> bool:
+        if self._atlas_paths is not None:
+            self._open_atlas()
+        if self.atlas is not None and key in self.atlas:
+            return True
+        return self.get(key) is not None
+
+    def sync(self, screen: pygame.Surface) -> None:
+        """Викликається раз на кадр: скидає кеш, якщо змінилась розкладка."""
+        layout_key = (config.CELL_SIZE, screen.get_size())
+        if layout_key != self._layout_key:
+            self._layout_key = layout_key
+            self._scaled.clear()
+
+    def invalidate(self) -> None:
+        self._scaled.clear()
+
+    def scaled(self, key: str, size: tuple[int, int]) -> pygame.Surface | None:
+        cache_key = (key, size)
+        surf = self._scaled.get(cache_key)
+        if surf is None:
+            image = self.get(key)
+            if image is None:
+                return None
+            surf = pygame.transform.smoothscale(image, size)
+            self._scaled[cache_key] = surf
+        return surf
+
+    def sprite(self, key: str, size: tuple[int, int]) -> tuple[pygame.Surface, pygame.Rect | None] | None:
+        """
+        (поверхня, area) для screen.blit / screen.blits: з атласу, якщо там є
+        спрайт такого розміру, інакше масштабована копія і area=None.
+        """
+        if self._atlas_paths is not None:
+            self._open_atlas()
+        if self.atlas is not None:
+            area = self.atlas.area(key, size)
+            if area is not None:
+                return self.atlas.surface, area
+        surf = self.scaled(key, size)
+        if surf is None:
+            return None
+        return surf, None
+
+
+def _source_stamp(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.basename(path), st.st_size, st.st_mtime_ns]
+
+
+def build_cache(cache_path: str = ASSET_CACHE_PATH, paths: dict[str, str] = IMAGE_PATHS) -> int:
+    """Упакувати всі текстури в один файл сирих RGBA-байтів. Повертає кількість."""
+    loader = AssetCache(paths, cache_path=None)
+    header: dict[str, dict] = {}
+    blobs: list[bytes] = []
+    offset = 0
+
+    for key, path in paths.items():
+        resolved = loader._resolve_path(path)
+        if resolved is None:
+            continue
+        img = pygame.image.load(resolved)
+        raw = pygame.image.tobytes(img, "RGBA")
+        header[key] = {
+            "source": _source_stamp(resolved),
+            "size": list(img.get_size()),
+            "offset": offset,
+            "length": len(raw),
+        }
+        blobs.append(raw)
+        offset += len(raw)
+
+    header_bytes = json.dumps(header).encode()
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(CACHE_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for raw in blobs:
+            f.write(raw)
+    os.replace(tmp_path, cache_path)
+    return len(header)
+
+
+if __name__ == "__main__":
+    count = build_cache()
+    print(f"✓ {ASSET_CACHE_PATH}: {count} текстур")
@@ -0,0 +1,170 @@
+"""
+Атлас текстур: фішки, отвори і кнопки, уже масштабовані до розмірів
+з config, в одному PNG + маніфест з прямокутниками (JSON).
+
+Будується офлайн: python -m game.atlas
+Замість десятка окремих поверхонь у пам'яті одна, а однакові спрайти
+(33 отвори, фішки) малюються одним викликом Surface.blits з area.
+
+Маніфест:
+    {"version": 1,
+     "sprites": {key: {"rect": [x, y, w, h], "source": [файл, розмір, mtime_ns]}}}
+"""
+
+import json
+import os
+
+import pygame
+
+from config import *
+
+VERSION = 1
+# ширина атласу; рядки («полиці») додаються вниз
+ATLAS_WIDTH = 512
+# прозорий проміжок між спрайтами, щоб згладжування не захоплювало сусіда
+PADDING = 1
+
+
+def atlas_sizes() -> dict[str, tuple[int, int]]:
+    """Ключ IMAGE_PATHS -> розмір, у якому спрайт малюється на екрані."""
+    peg = (PEG_DIAMETER, PEG_DIAMETER)
+    hole = (HOLE_DIAMETER, HOLE_DIAMETER)
+    hint = (HOLE_HINT_DIAMETER, HOLE_HINT_DIAMETER)
+    button = (BUTTON_WIDTH, BUTTON_HEIGHT)
+    sizes = {
+        "peg_base": peg,
+        "peg_selected": peg,
+        "peg_hint": peg,
+        "hole": hole,
+        "hole_empty": hole,
+        "hole_hint": hint,
+    }
+    for key in IMAGE_PATHS:
+        if key.startswith("button_"):
+            sizes[key] = button
+    return sizes
+
+
+def pack(sizes: dict[str, tuple[int, int]], width: int = ATLAS_WIDTH) -> tuple[dict[str, pygame.Rect], int]:
+    """
+    Пакування «полицями»: спрайти від найвищого до найнижчого,
+    зліва направо, поки влазять у ширину. Повертає (прямокутники, висоту).
+    """
+    rects: dict[str, pygame.Rect] = {}
+    x = y = shelf_h = 0
+    for key in sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k)):
+        w, h = sizes[key]
+        if w + PADDING > width:
+            raise ValueError(f"{key}: спрайт ширший за атлас ({w} > {width})")
+        if x + w + PADDING > width:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        rects[key] = pygame.Rect(x, y, w, h)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h + PADDING)
+    return rects, y + shelf_h
+
+
+class TextureAtlas:
+    """Поверхня атласу + прямокутники спрайтів за ключами."""
+
+    def __init__(self, surface: pygame.Surface, rects: dict[str, pygame.Rect]) -> None:
+        self.surface = surface
+        self.rects = rects
+
+    def area(self, key: str, size: tuple[int, int]) -> pygame.Rect | None:
+        """Прямокутник спрайта, якщо він є в атласі саме такого розміру."""
+        rect = self.rects.get(key)
+        if rect is None or rect.size != tuple(size):
+            return None
+        return rect
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rects
+
+    @classmethod
+    def load(cls, image_path: str, manifest_path: str, is_fresh=None) -> "TextureAtlas | None":
+        """
+        None, якщо атлас ще не побудований або зіпсований.
+        is_fresh(key, source) – перевірка, що PNG-джерело спрайта не змінилось.
+        """
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠ Маніфест атласу {manifest_path} пропущено: {e}")
+            return None
+
+        if manifest.get("version") != VERSION:
+            print(f"⚠ Маніфест атласу {manifest_path}: інша версія, перебудуйте")
+            return None
+
+        rects = {}
+        for key, entry in manifest.get("sprites", {}).items():
+            if is_fresh is not None and not is_fresh(key, entry.get("source")):
+                continue
+            rects[key] = pygame.Rect(entry["rect"])
+        if not rects:
+            return None
+
+        try:
+            surface = pygame.image.load(image_path)
+        except (pygame.error, OSError) as e:
+            print(f"⚠ Не вдалось завантажити атлас {image_path}: {e}")
+            return None
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return cls(surface, rects)
+
+
+def build_atlas(
+    image_path: str = ATLAS_PATH,
+    manifest_path: str = ATLAS_MANIFEST_PATH,
+    paths: dict[str, str] = IMAGE_PATHS,
+) -> int:
+    """Масштабувати спрайти, спакувати в один PNG і записати маніфест. Повертає кількість."""
+    from game.assets import AssetCache, _source_stamp
+
+    loader = AssetCache(paths, cache_path=None)
+    sizes = {}
+    sources = {}
+    for key, size in atlas_sizes().items():
+        path = paths.get(key)
+        resolved = loader._resolve_path(path) if path else None
+        if resolved is None:
+            continue
+        sizes[key] = size
+        sources[key] = resolved
+
+    rects, height = pack(sizes)
+    atlas = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+    for key, rect in rects.items():
+        image = pygame.image.load(sources[key])
+        if image.get_bitsize() != 32:
+            image = image.convert(32, pygame.SRCALPHA)
+        # ADD поверх нулів – точна копія пікселів разом з альфою, без змішування
+        atlas.blit(pygame.transform.smoothscale(image, rect.size), rect, special_flags=pygame.BLEND_RGBA_ADD)
+
+    manifest = {
+        "version": VERSION,
+        "sprites": {
+            key: {"rect": list(rect), "source": _source_stamp(sources[key])}
+            for key, rect in sorted(rects.items())
+        },
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(image_path)), exist_ok=True)
+    pygame.image.save(atlas, image_path)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return len(rects)
+
+
+if __name__ == "__main__":
+    count = build_atlas()
+    print(f"✓ {ATLAS_PATH}: {count} спрайтів, маніфест {ATLAS_MANIFEST_PATH}")
@@ -0,0 +1,140 @@
+"""
+Пошук назустріч: назад від цілі і вперед від поточної позиції.
+
+Кожен стрибок знімає одну фішку, тож шари пошуку – це кількості фішок.
+Зворотний фронт будується вшир від цілі зворотними стрибками (фішка в
+target, порожні source і middle): shells[k] – канонічні позиції з k + 1
+фішками, з яких ціль досяжна. Шари ростуть, доки останній не перевищить
+LAYER_LIMIT позицій.
+
+Прямий бік – пошук у глибину, як у Solver, але він зупиняється на
+кількості фішок останнього шару: замість розбору нижньої частини дерева –
+одна перевірка в множині. Таблиця програшних позицій не росте нижче
+фронту, а пагоди відсікають гілки над ним.
+
+Прямий фронт вшир тут не тримається: середні шари англійської дошки –
+сотні тисяч і мільйони канонічних позицій, а пошук у глибину з таблицею
+програшних позицій доходить до зворотного фронту за лічені вузли.
+
+Симетрії – ті, що зберігають ціль, тож шари і таблиця не залежать від
+стартової позиції і живуть між викликами solve(). Ходи після зустрічі
+відновлюються з конкретної позиції: на кожному кроці береться стрибок,
+канонічний образ якого лежить у наступному шарі.
+"""
+
+from game.geometries import DEFAULT_GEOMETRY
+from game.pagoda import get_pagoda_set
+from game.position import Geometry
+from game.solver import Symmetries
+
+# шар зворотного фронту, після якого він більше не розширюється
+LAYER_LIMIT = 10_000
+
+
+class BidirectionalSolver:
+    """
+    Той самий інтерфейс, що й у Solver:
+
+        solver = BidirectionalSolver(geometry, goal)
+        jumps = solver.solve(bits)      # номери стрибків або None
+
+    goal=None – одна фішка будь-де, goal=(r, c) – у цій клітинці.
+    Зворотний фронт будується при першому solve().
+    """
+
+    def __init__(
+        self,
+        geometry: Geometry = DEFAULT_GEOMETRY,
+        goal: tuple[int, int] | None = None,
+        prune: bool = True,
+        layer_limit: int = LAYER_LIMIT,
+    ) -> None:
+        self.geometry = geometry
+        self.goal = goal
+        self.layer_limit = layer_limit
+        self.symmetries = Symmetries(geometry, goal)
+        self.pagodas = get_pagoda_set(geometry, goal) if prune and goal is not None else None
+        self.shells: list[set[int]] = []
+        self.dead: set[int] = set()
+        self.nodes = 0
+
+    def solve(self, bits: int) -> list[int] | None:
+        """Послідовність номерів стрибків до цілі або None, якщо її немає."""
+        if not self.shells:
+            self._build_shells()
+        canonical = self.symmetries.canonical
+
+        pegs = bits.bit_count()
+        if pegs == 0:
+            return None
+        if pegs <= len(self.shells):
+            if canonical(bits) not in self.shells[pegs - 1]:
+                return None
+            return self._path_to_goal(bits, pegs - 1)
+
+        path: list[int] = []
+        if not self._search(bits, path, pegs - len(self.shells)):
+            return None
+        for j in path:
+            bits ^= self.geometry.jump_checks[j][2]
+        return path + self._path_to_goal(bits, len(self.shells) - 1)
+
+    def is_solvable(self, bits: int) -> bool:
+        return self.solve(bits) is not None
+
+    # --- зворотний фронт --- #
+
+    def _build_shells(self) -> None:
+        g = self.geometry
+        canonical = self.symmetries.canonical
+        if self.goal is not None:
+            layer = {1 << g.index[self.goal]}
+        else:
+            layer = {canonical(1 << i) for i in range(g.size)}
+        self.shells = [layer]
+
+        while len(layer) <= self.layer_limit and len(self.shells) < g.size:
+            parents = set()
+            for bits in layer:
+                for need, target, flip in g.jump_checks:
+                    if bits & target and not bits & need:
+                        parents.add(canonical(bits ^ flip))
+            if not parents:
+                break
+            layer = parents
+            self.shells.append(layer)
+
+    # --- прямий пошук --- #
+
+    def _search(self, bits: int, path: list[int], depth: int) -> bool:
+        self.nodes += 1
+
+        key = self.symmetries.canonical(bits)
+        if depth == 0:
+            return key in self.shells[-1]
+        if key in self.dead:
+            return False
+        if self.pagodas is not None and self.pagodas.is_lost(bits):
+            return False
+
+        for j, (need, target, flip) in enumerate(self.geometry.jump_checks):
+            if bits & need == need and not bits & target:
+                path.append(j)
+                if self._search(bits ^ flip, path, depth - 1):
+                    return True
+                path.pop()
+
+        self.dead.add(key)
+        return False
+
+    def _path_to_goal(self, bits: int, k: int) -> list[int]:
+        """Стрибки від bits (канонічний образ – у shells[k]) до цілі."""
+        canonical = self.symmetries.canonical
+        path: list[int] = []
+        for layer in reversed(self.shells[:k]):
+            for j, (need, target, flip) in enumerate(self.geometry.jump_checks):
+                if bits & need == need and not bits & target and canonical(bits ^ flip) in layer:
+                    path.append(j)
+                    bits ^= flip
+                    break
+        return path
@@ -1,159 +1,275 @@
-import time
 import random
 import pygame
 
 from config import *
-from game.peg import Peg
+from game.assets import AssetCache
+from game.peg import Peg, pixel_centers
+from game.policies import best_moves
+from game.geometries import DEFAULT_GEOMETRY
+from game.history import MoveHistory
+from game.pagoda import get_pagoda_set
+from game.position import Geometry, Position
+from game.puzzles import Puzzle
+from game.bidirectional import BidirectionalSolver
+from game.solver import Solver
+from game.windb import WinDatabase
+
+# таблиця виграшних позицій відкривається один раз на процес
+_win_db: WinDatabase | None = None
+_win_db_loaded = False
+
+
+def get_win_database() -> WinDatabase | None:
+    global _win_db, _win_db_loaded
+    if not _win_db_loaded:
+        _win_db = WinDatabase.open_default(DEFAULT_GEOMETRY)
+        _win_db_loaded = True
+    return _win_db
+
+
+def pick_hint_jump(geometry: Geometry, bits: int, rng=random, from_start: bool = True) -> int | None:
+    """
+    Швидка підказка без пошуку: None, якщо ходів немає.
+    from_start – партія почалась зі стандартного старту; лише тоді
+    таблиця виграшних позицій щось знає про позицію.
+    """
+    jumps = geometry.legal_jumps(bits)
+    if not jumps:
+        return None
+
+    # якщо є таблиця – не пропонуємо ходи у програшні позиції
+    db = get_win_database() if geometry is DEFAULT_GEOMETRY and from_start else None
+    if db is not None:
+        flips = geometry.jump_checks
+        winning = [j for j in jumps if db.is_winnable(bits ^ flips[j][2])]
+        if winning:
+            jumps = winning
+
+    # найкраща оцінка позиції після ходу (Evaluator), серед рівних – випадково
+    return rng.choice(best_moves(geometry, bits, jumps))
 
 
 class Board:
     """
     Логіка дошки:
-    - 7x7, але дозволені клітинки задає BOARD_MASK
+    - сітка і дозволені клітинки задаються геометрією (config.BOARD_GEOMETRY)
     - старт: усі дозволені заповнені фішками, центр порожній
     - хід: фішка стрибає через сусідню в порожній отвір
+
+    Сам стан зберігається в Position (бітова маска), а cells містить
+    Peg-об'єкти лише для зайнятих отворів – для малювання і кліків.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, geometry: Geometry = DEFAULT_GEOMETRY) -> None:
+        self.geometry = geometry
+        self.rows = geometry.rows
+        self.cols = geometry.cols
+
+        # сітка по центру по горизонталі; велику дошку піднімаємо над кнопками
+        self.origin_x = (SCREEN_WIDTH - self.cols * CELL_SIZE) // 2
+        self.origin_y = min(BOARD_OFFSET_Y, BUTTON_Y - 10 - self.rows * CELL_SIZE)
+        # піксельні центри клітинок – спільна таблиця для всіх фішок
+        self.centers = pixel_centers((self.origin_x, self.origin_y), self.rows, self.cols)
+
         self.cells: list[list[Peg | None]] = [
-            [None for _ in range(BOARD_COLS)] for _ in range(BOARD_ROWS)
+            [None for _ in range(self.cols)] for _ in range(self.rows)
         ]
         self.selected_peg: Peg | None = None
         self.valid_moves: list[dict] = []
-        self.move_history: list[dict] = []
+        # де має залишитись остання фішка (None – будь-де); задає задача
+        self.goal: tuple[int, int] | None = None
 
-        # автопідказка
-        self.last_action_time = time.time()
+        # автопідказка (таймер веде Game)
         self.hint_source: Peg | None = None
         self.hint_move: dict | None = None
 
+        # розв'язувачі за ціллю (None – будь-де, клітинка – центр);
+        # таблиці програшних позицій живуть між викликами
+        self._solvers: dict[tuple[int, int] | None, Solver | BidirectionalSolver] = {}
+        # останній результат is_lost за ціллю: (bits, lost)
+        self._lost_cache: dict[tuple[int, int] | None, tuple[int, bool]] = {}
+
+        # позиція і порожня історія
         self.initialize_board()
 
     # --- ініціалізація --- #
 
     def initialize_board(self) -> None:
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                if BOARD_MASK[r][c] == 1:
-                    if r == 3 and c == 3:
-                        self.cells[r][c] = None
-                    else:
-                        self.cells[r][c] = Peg(r, c, "base")
-                else:
-                    self.cells[r][c] = None
+        self.position = Position.start(self.geometry)
+        self.move_history = MoveHistory(self.geometry, self.position.bits)
+        self._sync_cells()
+
+    def load_puzzle(self, puzzle: Puzzle) -> None:
+        """Почати з позиції задачі (game.puzzles) замість стандартного старту."""
+        if puzzle.geometry is not self.geometry:
+            raise ValueError(f"Задача для дошки {puzzle.geometry.name}, а не {self.geometry.name}")
+        self.position = Position(self.geometry, puzzle.bits)
+        self.move_history = MoveHistory(self.geometry, puzzle.bits)
+        self.goal = puzzle.goal
+        self._sync_cells()
+        self._clear_selection()
+
+    def _sync_cells(self) -> None:
+        """Перебудувати Peg-об'єкти за бітовою маскою позиції."""
+        for r in range(self.rows):
+            for c in range(self.cols):
+                self.cells[r][c] = None
+        for r, c in self.geometry.cells_from_bits(self.position.bits):
+            self.cells[r][c] = self._new_peg(r, c)
+
+    def _new_peg(self, row: int, col: int) -> Peg:
+        return Peg(row, col, "base", self.centers)
 
     # --- утиліти --- #
 
     def board_pos_from_pixel(self, pos):
         x, y = pos
         if not (
-            BOARD_OFFSET_X <= x < BOARD_OFFSET_X + BOARD_COLS * CELL_SIZE
-            and BOARD_OFFSET_Y <= y < BOARD_OFFSET_Y + BOARD_ROWS * CELL_SIZE
+            self.origin_x <= x < self.origin_x + self.cols * CELL_SIZE
+            and self.origin_y <= y < self.origin_y + self.rows * CELL_SIZE
         ):
             return None
 
-        col = (x - BOARD_OFFSET_X) // CELL_SIZE
-        row = (y - BOARD_OFFSET_Y) // CELL_SIZE
-        if 0 <= row < BOARD_ROWS and 0 <= col < BOARD_COLS and BOARD_MASK[row][col] == 1:
+        col = (x - self.origin_x) // CELL_SIZE
+        row = (y - self.origin_y) // CELL_SIZE
+        if (row, col) in self.geometry.index:
             return row, col
         return None
 
     def get_peg_at(self, row, col) -> Peg | None:
-        if 0 <= row < BOARD_ROWS and 0 <= col < BOARD_COLS:
+        if 0 <= row < self.rows and 0 <= col < self.cols:
             return self.cells[row][col]
         return None
 
     def is_valid_cell(self, row, col) -> bool:
-        return (
-            0 <= row < BOARD_ROWS
-            and 0 <= col < BOARD_COLS
-            and BOARD_MASK[row][col] == 1
-        )
+        return (row, col) in self.geometry.index
+
+    def _move_from_jump(self, j: int) -> dict:
+        si, mi, ti = self.geometry.jump_cells[j]
+        cells = self.geometry.cells
+        return {
+            "source": cells[si],
+            "middle": cells[mi],
+            "target": cells[ti],
+            "jump": j,
+        }
 
     # --- рендеринг --- #
 
-    def draw(self, screen: pygame.Surface, images: dict) -> None:
-        self._draw_board_background(screen, images)
-        self._draw_holes(screen, images)
-        self._draw_hint_holes(screen, images)
-
-        # звичайні фішки
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                peg = self.cells[r][c]
-                if peg and peg.is_visible():
-                    peg.draw(screen, images)
+    def draw(self, screen: pygame.Surface, assets: AssetCache) -> None:
+        self._draw_board_background(screen, assets)
+        self._draw_holes(screen, assets)
+        self._draw_pieces(screen, assets)
+
+    def draw_static(self, screen: pygame.Surface, assets: AssetCache) -> None:
+        """Шар, що не змінюється під час гри: дошка і порожні отвори."""
+        self._draw_board_background(screen, assets)
+        self._draw_holes(screen, assets, bits=0)
+
+    def draw_dynamic(self, screen: pygame.Surface, assets: AssetCache) -> None:
+        """Усе, що малюється поверх статичного шару."""
+        self._draw_holes(screen, assets, filled_only=True)
+        self._draw_pieces(screen, assets)
+
+    def _draw_pieces(self, screen: pygame.Surface, assets: AssetCache) -> None:
+        self._draw_hint_holes(screen, assets)
+
+        # звичайні фішки – одним blits (спрайти з атласу або масштабовані копії)
+        batch = []
+        for row in self.cells:
+            for peg in row:
+                if peg:
+                    blit = peg.blit_args(assets)
+                    if blit is None:
+                        peg.draw(screen, assets)
+                    else:
+                        batch.append(blit)
+        if batch:
+            screen.blits(batch, doreturn=False)
 
         # підсвітити фішку, якою ходити при підказці (якщо нема обраної)
-        if (
-            self.selected_peg is None
-            and self.hint_source is not None
-            and self.hint_source.is_visible()
-        ):
-            self._draw_hint_source_peg(screen, images)
+        if self.selected_peg is None and self.hint_source is not None:
+            self._draw_hint_source_peg(screen, assets)
 
-    def _draw_board_background(self, screen: pygame.Surface, images: dict) -> None:
+    def _draw_board_background(self, screen: pygame.Surface, assets: AssetCache) -> None:
         """Малюємо дерев'яну дошку (Pole.png) по центру сітки."""
-        if "board" not in images:
-            return
-
-        img = images["board"]
-
         # розміри сітки з отворами
-        grid_w = BOARD_COLS * CELL_SIZE
-        grid_h = BOARD_ROWS * CELL_SIZE
-        grid_cx = BOARD_OFFSET_X + grid_w // 2
-        grid_cy = BOARD_OFFSET_Y + grid_h // 2
+        grid_w = self.cols * CELL_SIZE
+        grid_h = self.rows * CELL_SIZE
+        grid_cx = self.origin_x + grid_w // 2
+        grid_cy = self.origin_y + grid_h // 2
 
         # дошка трохи більша за сітку
         base_size = max(grid_w, grid_h)
         board_size = int(base_size * 1.25)
 
-        scaled = pygame.transform.smoothscale(img, (board_size, board_size))
+        if "board" not in assets:
+            # векторна заглушка (--no-assets)
+            rect = pygame.Rect(0, 0, board_size, board_size)
+            rect.center = (grid_cx, grid_cy)
+            pygame.draw.rect(screen, (222, 184, 135), rect, border_radius=40)
+            pygame.draw.rect(screen, (160, 120, 80), rect, 3, border_radius=40)
+            return
+
+        scaled = assets.scaled("board", (board_size, board_size))
         rect = scaled.get_rect(center=(grid_cx, grid_cy))
         screen.blit(scaled, rect)
 
-    def _draw_holes(self, screen: pygame.Surface, images: dict) -> None:
+    def _draw_holes(
+        self,
+        screen: pygame.Surface,
+        assets: AssetCache,
+        bits: int | None = None,
+        filled_only: bool = False,
+    ) -> None:
         """
         Малюємо усі виямки (вони завжди видимі).
         Робимо їх трохи більшими за кульки – розмір HOLE_DIAMETER.
+        bits=0 – усі отвори порожні (статичний шар),
+        filled_only – лише отвори під фішками.
         """
-        hole_img_raw = images.get("hole")
-        if hole_img_raw is None:
-            return
+        if bits is None:
+            bits = self.position.bits
 
-        hole_empty_raw = images.get("hole_empty", hole_img_raw)
+        if "hole" not in assets:
+            self._draw_holes_fallback(screen, bits, filled_only)
+            return
 
-        hole_img = pygame.transform.smoothscale(
-            hole_img_raw, (HOLE_DIAMETER, HOLE_DIAMETER)
-        )
-        hole_empty_img = pygame.transform.smoothscale(
-            hole_empty_raw, (HOLE_DIAMETER, HOLE_DIAMETER)
-        )
+        size = (HOLE_DIAMETER, HOLE_DIAMETER)
+        hole = assets.sprite("hole", size)
+        hole_empty = assets.sprite("hole_empty", size) or hole
 
         offset_in_cell = (CELL_SIZE - HOLE_DIAMETER) // 2
 
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                if BOARD_MASK[r][c] != 1:
-                    continue
-
-                peg = self.cells[r][c]
-                img = hole_img if peg and peg.is_visible() else hole_empty_img
-
-                x = BOARD_OFFSET_X + c * CELL_SIZE + offset_in_cell
-                y = BOARD_OFFSET_Y + r * CELL_SIZE + offset_in_cell
-                screen.blit(img, (x, y))
-
-    def _draw_hint_holes(self, screen: pygame.Surface, images: dict) -> None:
+        batch = []
+        for i, (r, c) in enumerate(self.geometry.cells):
+            if bits >> i & 1:
+                img, area = hole
+            elif filled_only:
+                continue
+            else:
+                img, area = hole_empty
+
+            x = self.origin_x + c * CELL_SIZE + offset_in_cell
+            y = self.origin_y + r * CELL_SIZE + offset_in_cell
+            batch.append((img, (x, y), area))
+        screen.blits(batch, doreturn=False)
+
+    def _draw_holes_fallback(self, screen: pygame.Surface, bits: int, filled_only: bool) -> None:
+        radius = HOLE_DIAMETER // 2
+        for i, (r, c) in enumerate(self.geometry.cells):
+            center = self.centers[r][c]
+            if bits >> i & 1:
+                pygame.draw.circle(screen, (170, 130, 90), center, radius)
+            elif not filled_only:
+                pygame.draw.circle(screen, (190, 150, 110), center, radius)
+                pygame.draw.circle(screen, (140, 100, 70), center, radius, 2)
+
+    def _draw_hint_holes(self, screen: pygame.Surface, assets: AssetCache) -> None:
         """Малюємо зелені виямки для можливих ходів, точно по центру."""
-        hint_raw = images.get("hole_hint")
-        if hint_raw is None:
-            return
-
         # збільшений розмір хінту
-        hint_size = int(HOLE_DIAMETER * 1.55)
-        hint_img = pygame.transform.smoothscale(hint_raw, (hint_size, hint_size))
+        hint_size = HOLE_HINT_DIAMETER
+        hint = assets.sprite("hole_hint", (hint_size, hint_size))
 
         # позиція центру виямки
         base_offset = (CELL_SIZE - HOLE_DIAMETER) // 2
@@ -161,35 +277,64 @@ class Board:
         # різниця між збільшеним і справжнім отвором
         center_fix = (hint_size - HOLE_DIAMETER) // 2
 
-        def draw_hint_at(r, c):
-            x = BOARD_OFFSET_X + c * CELL_SIZE + base_offset - center_fix
-            y = BOARD_OFFSET_Y + r * CELL_SIZE + base_offset - center_fix
-            screen.blit(hint_img, (x, y))
-
-        # можливі ходи для вибраної фішки
-        for move in self.valid_moves:
-            tr, tc = move["target"]
-            draw_hint_at(tr, tc)
-
-        # автопідказка
+        # можливі ходи для вибраної фішки + автопідказка
+        targets = [move["target"] for move in self.valid_moves]
         if self.selected_peg is None and self.hint_move is not None:
-            tr, tc = self.hint_move["target"]
-            draw_hint_at(tr, tc)
-
-    def _draw_hint_source_peg(self, screen: pygame.Surface, images: dict) -> None:
+            targets.append(self.hint_move["target"])
+
+        batch = []
+        for r, c in targets:
+            x = self.origin_x + c * CELL_SIZE + base_offset - center_fix
+            y = self.origin_y + r * CELL_SIZE + base_offset - center_fix
+            if hint is not None:
+                batch.append((hint[0], (x, y), hint[1]))
+            else:
+                center = (x + hint_size // 2, y + hint_size // 2)
+                pygame.draw.circle(screen, GREEN, center, HOLE_DIAMETER // 2 + 2, 3)
+        if batch:
+            screen.blits(batch, doreturn=False)
+
+    def _draw_hint_source_peg(self, screen: pygame.Surface, assets: AssetCache) -> None:
         """Підсвічуємо фішку, якою потрібно ходити (для підказки H)."""
         peg = self.hint_source
         if peg is None:
             return
 
-        if "peg_hint" in images:
-            size = peg.radius * 2
-            img = pygame.transform.smoothscale(images["peg_hint"], (size, size))
-            rect = img.get_rect(center=(peg.x, peg.y))
-            screen.blit(img, rect)
+        size = peg.radius * 2
+        sprite = assets.sprite("peg_hint", (size, size))
+        if sprite is not None:
+            img, area = sprite
+            screen.blit(img, (peg.x - size // 2, peg.y - size // 2), area)
         else:
             pygame.draw.circle(screen, GREEN, (peg.x, peg.y), peg.radius + 4, 3)
 
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        """Область клітинки разом з фішкою і підсвіткою, що виходять за її межі."""
+        size = max(CELL_SIZE, PEG_DIAMETER, HOLE_HINT_DIAMETER) + 2
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = self.centers[row][col]
+        return rect
+
+    def render_states(self) -> dict:
+        """Стан кожної клітинки для рендерера: змінився стан – перемалювати."""
+        hint_targets = {move["target"] for move in self.valid_moves}
+        hint_source = None
+        if self.selected_peg is None and self.hint_move is not None:
+            hint_targets.add(self.hint_move["target"])
+            if self.hint_source is not None:
+                hint_source = (self.hint_source.row, self.hint_source.col)
+
+        states = {}
+        for cell in self.geometry.cells:
+            r, c = cell
+            peg = self.cells[r][c]
+            states[cell] = (
+                peg.state if peg else None,
+                cell in hint_targets,
+                cell == hint_source,
+            )
+        return states
+
     # --- кліки --- #
 
     def handle_click(self, pos) -> bool:
@@ -197,16 +342,19 @@ class Board:
         board_pos = self.board_pos_from_pixel(pos)
         if board_pos is None:
             return False
+        return self.click_cell(*board_pos)
 
-        row, col = board_pos
+    def click_cell(self, row: int, col: int) -> bool:
+        """Клік по клітинці дошки (без пікселів – для сервера). True, якщо стався хід."""
+        if not self.is_valid_cell(row, col):
+            return False
         clicked_peg = self.get_peg_at(row, col)
 
-        # будь-який клік скидає таймер автопідказки
-        self.last_action_time = time.time()
+        # будь-який клік прибирає автопідказку
         self.hint_source = None
         self.hint_move = None
 
-        if clicked_peg and clicked_peg.is_visible():
+        if clicked_peg:
             return self._handle_peg_click(clicked_peg)
         else:
             return self._handle_empty_click(row, col)
@@ -245,25 +393,10 @@ class Board:
     # --- пошук ходів --- #
 
     def _get_valid_moves(self, peg: Peg) -> list[dict]:
-        moves: list[dict] = []
-        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-
-        for dr, dc in directions:
-            mid_r = peg.row + dr // 2
-            mid_c = peg.col + dc // 2
-            tr = peg.row + dr
-            tc = peg.col + dc
-
-            if self._is_valid_move(peg.row, peg.col, mid_r, mid_c, tr, tc):
-                moves.append(
-                    {
-                        "source": (peg.row, peg.col),
-                        "middle": (mid_r, mid_c),
-                        "target": (tr, tc),
-                    }
-                )
-
-        return moves
+        return [
+            self._move_from_jump(j)
+            for j in self.position.jumps_from(peg.row, peg.col)
+        ]
 
     def _is_valid_move(
         self,
@@ -274,154 +407,194 @@ class Board:
         tr: int,
         tc: int,
     ) -> bool:
-        if not (
-            self.is_valid_cell(sr, sc)
-            and self.is_valid_cell(mid_r, mid_c)
-            and self.is_valid_cell(tr, tc)
-        ):
+        index = self.geometry.index
+        si = index.get((sr, sc))
+        ti = index.get((tr, tc))
+        if si is None or ti is None:
             return False
 
-        source_peg = self.get_peg_at(sr, sc)
-        middle_peg = self.get_peg_at(mid_r, mid_c)
-        target_peg = self.get_peg_at(tr, tc)
-
-        if source_peg is None or not source_peg.is_visible():
+        j = self.geometry.jump_by_ends.get((si, ti))
+        if j is None or self.geometry.jump_cells[j][1] != index.get((mid_r, mid_c)):
             return False
 
-        if middle_peg is None or not middle_peg.is_visible():
-            return False
+        need, target, _ = self.geometry.jump_checks[j]
+        bits = self.position.bits
+        return bits & need == need and not bits & target
 
-        if target_peg is not None and target_peg.is_visible():
-            return False
+    # --- виконання ходу / undo --- #
 
+    def play_jump(self, j: int) -> bool:
+        """Хід за номером стрибка; False, якщо він зараз нелегальний."""
+        if j not in self.position.moves:
+            return False
+        self._make_move(self._move_from_jump(j))
         return True
 
-    # --- виконання ходу / undo --- #
-
     def _make_move(self, move: dict) -> None:
+        self._apply_move(move)
+        self.move_history.push(move["jump"], self.position.bits)
+
+    def _apply_move(self, move: dict) -> None:
         sr, sc = move["source"]
         mr, mc = move["middle"]
         tr, tc = move["target"]
-
-        moving_peg = self.cells[sr][sc]
-        jumped_peg = self.cells[mr][mc]
-
-        self.move_history.append(
-            {
-                "source": (sr, sc),
-                "middle": (mr, mc),
-                "target": (tr, tc),
-            }
-        )
+        self.position.apply(move["jump"])
 
         # рух
+        moving_peg = self.cells[sr][sc]
         self.cells[sr][sc] = None
         self.cells[tr][tc] = moving_peg
         if moving_peg:
-            moving_peg.row = tr
-            moving_peg.col = tc
-            moving_peg.update_pixel_position()
+            moving_peg.move_to(tr, tc)
             moving_peg.set_state("base")
 
         # з'їли середню
-        if jumped_peg:
-            jumped_peg.hide()
+        self.cells[mr][mc] = None
 
-        self.selected_peg = None
-        self.valid_moves.clear()
+        self._clear_selection()
 
     def undo_move(self) -> bool:
-        if not self.move_history:
+        j = self.move_history.undo()
+        if j is None:
             return False
 
-        last = self.move_history.pop()
+        last = self._move_from_jump(j)
         sr, sc = last["source"]
         mr, mc = last["middle"]
         tr, tc = last["target"]
+        self.position.undo(j)
 
         moving_peg = self.cells[tr][tc]
-        jumped_peg = self.cells[mr][mc]
-
         self.cells[tr][tc] = None
         self.cells[sr][sc] = moving_peg
         if moving_peg:
-            moving_peg.row = sr
-            moving_peg.col = sc
-            moving_peg.update_pixel_position()
+            moving_peg.move_to(sr, sc)
             moving_peg.set_state("base")
 
-        if jumped_peg:
-            jumped_peg.show()
+        # повертаємо з'їдену фішку
+        self.cells[mr][mc] = self._new_peg(mr, mc)
+
+        self._clear_selection()
+        return True
 
+    def redo_move(self) -> bool:
+        history = self.move_history
+        # хід з хвоста має бути легальним у поточній позиції
+        if not history.can_redo() or history.moves[history.cursor] not in self.position.moves:
+            return False
+        j = history.redo()
+        self._apply_move(self._move_from_jump(j))
+        return True
+
+    def seek_history(self, n: int) -> None:
+        """Перейти до стану після n ходів історії (відтворення з контрольної точки)."""
+        bits = self.move_history.seek(n)
+        self.position = Position(self.geometry, bits)
+        self._sync_cells()
+        self._clear_selection()
+
+    def load_history(self, history: MoveHistory) -> None:
+        """Відновити партію з історії (наприклад, MoveHistory.load)."""
+        self.move_history = history
+        self.seek_history(len(history))
+
+    def _clear_selection(self) -> None:
         self.selected_peg = None
         self.valid_moves.clear()
-        self.last_action_time = time.time()
         self.hint_source = None
         self.hint_move = None
-        return True
 
     # --- підказки --- #
 
-    def update_hints(self) -> None:
-        if self.selected_peg is not None:
-            return
-
-        now = time.time()
-        if now - self.last_action_time < HINT_DELAY / 1000:
-            return
-
-        self._show_best_hint()
-
     def _show_best_hint(self) -> None:
+        self.show_hint(pick_hint_jump(self.geometry, self.position.bits, from_start=self.from_start))
+
+    def show_hint(self, j: int | None) -> None:
+        """Підсвітити стрибок j як підказку (None – прибрати підказку)."""
         self.hint_source = None
         self.hint_move = None
+        if j is None or j not in self.position.moves:
+            return
 
-        all_moves: list[tuple[Peg, dict]] = []
+        move = self._move_from_jump(j)
+        sr, sc = move["source"]
+        self.hint_source = self.cells[sr][sc]
+        self.hint_move = move
 
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                peg = self.cells[r][c]
-                if peg and peg.is_visible():
-                    for move in self._get_valid_moves(peg):
-                        all_moves.append((peg, move))
+    def find_solution(self, to_center: bool = False) -> list[dict] | None:
+        """
+        Чи можна ще залишити одну фішку (за бажанням – у центрі, для задачі
+        з ціллю – у цілі)? Повертає послідовність ходів від поточної позиції або None.
+        """
+        goal = self.geometry.center if to_center else self.goal
+        solver = self._solvers.get(goal)
+        if solver is None:
+            solver_class = BidirectionalSolver if SOLVER_MODE == "bidirectional" else Solver
+            solver = self._solvers[goal] = solver_class(self.geometry, goal)
+
+        jumps = solver.solve(self.position.bits)
+        if jumps is None:
+            return None
+        return [self._move_from_jump(j) for j in jumps]
 
-        if not all_moves:
-            return
+    def is_solvable(self, to_center: bool = False) -> bool:
+        return self.find_solution(to_center) is not None
 
-        center_r, center_c = 3, 3
-        scored = []
-        for peg, move in all_moves:
-            tr, tc = move["target"]
-            dist = abs(tr - center_r) + abs(tc - center_c)
-            scored.append((dist, peg, move))
+    @property
+    def from_start(self) -> bool:
+        """Партія почалась зі стандартного старту (а не з задачі)."""
+        return self.move_history.start_bits == self.geometry.start_bits()
 
-        scored.sort(key=lambda x: x[0])
-        best_dist = scored[0][0]
-        candidates = [item for item in scored if item[0] == best_dist]
-        _, peg, move = random.choice(candidates)
+    def is_winnable(self) -> bool | None:
+        """
+        Відповідь з таблиці виграшних позицій за один пошук.
+        None – таблиці немає (або вона для іншої дошки чи цілі), або партія
+        почалась не зі стандартного старту (задача): у таблиці лише
+        позиції, досяжні з нього.
+        """
+        db = get_win_database() if self.geometry is DEFAULT_GEOMETRY else None
+        if db is None or db.goal is not None or not self.from_start:
+            return None
+        return db.is_winnable(self.position.bits)
 
-        self.hint_source = peg
-        self.hint_move = move
+    def is_lost(self, to_center: bool = False) -> bool:
+        """
+        True, якщо вже доведено, що одну фішку (у центрі або в цілі задачі)
+        не залишити:
+        точна відповідь таблиці виграшних позицій або пагода-оцінка.
+        Дешево – можна викликати після кожного ходу.
+        """
+        goal = self.geometry.center if to_center else self.goal
+        bits = self.position.bits
+        cached = self._lost_cache.get(goal)
+        if cached is not None and cached[0] == bits:
+            return cached[1]
+
+        winnable = self.is_winnable() if goal is None else None
+        if winnable is not None:
+            lost = not winnable
+        else:
+            lost = get_pagoda_set(self.geometry, goal).is_lost(bits)
+        self._lost_cache[goal] = (bits, lost)
+        return lost
 
     # --- стани гри --- #
 
     def get_peg_count(self) -> int:
-        cnt = 0
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                peg = self.cells[r][c]
-                if peg and peg.is_visible():
-                    cnt += 1
-        return cnt
+        return self.position.peg_count()
+
+    def is_won(self) -> bool:
+        """Залишилась одна фішка – і в цілі, якщо її задано."""
+        bits = self.position.bits
+        if bits.bit_count() != 1:
+            return False
+        return self.goal is None or bits == 1 << self.geometry.index[self.goal]
 
     def has_valid_moves(self) -> bool:
-        for r in range(BOARD_ROWS):
-            for c in range(BOARD_COLS):
-                peg = self.cells[r][c]
-                if peg and peg.is_visible():
-                    if self._get_valid_moves(peg):
-                        return True
-        return False
+        return self.position.has_legal_jump()
+
+    def get_legal_move_count(self) -> int:
+        return self.position.move_count()
 
     def reset(self) -> None:
-        self.__init__()
+        self.__init__(self.geometry)
@@ -0,0 +1,117 @@
+"""
+Оцінка позицій пакетом на NumPy.
+
+Позиції – масив (N, size) з 0/1 (для англійської дошки (N, 33)),
+тож усі дочірні позиції одного ходу оцінюються одним викликом.
+
+Ознаки (більше – краще, знак задають ваги):
+- pagoda    – запас пагода-функції над цільовою позицією (одна фішка в центрі);
+              від'ємний запас означає, що центр уже недосяжний
+- isolated  – фішки без жодного сусіда: їх уже нічим не забрати
+- corners   – фішки в кутах і на «кінцях» дошки (клітинки з ≤ 2 сусідами)
+- mobility  – кількість можливих стрибків
+"""
+
+import numpy as np
+
+from game.pagoda import fibonacci_pagodas
+from game.position import Geometry
+
+FEATURES = ("pagoda", "isolated", "corners", "mobility")
+
+DEFAULT_WEIGHTS = {
+    "pagoda": 0.05,
+    "isolated": -3.0,
+    "corners": -1.0,
+    "mobility": 0.3,
+}
+
+
+def center_pagoda(geometry: Geometry) -> np.ndarray:
+    """Пагода Фібоначчі з вершиною в центрі (див. game.pagoda)."""
+    if geometry.center is None:
+        return np.zeros(geometry.size, dtype=np.int64)
+    weights = fibonacci_pagodas(geometry, geometry.index[geometry.center])[0]
+    return np.array(weights, dtype=np.int64)
+
+
+class Evaluator:
+    """
+    evaluator = Evaluator(geometry)
+    scores = evaluator.score(evaluator.to_array(children))
+    """
+
+    def __init__(self, geometry: Geometry, weights: dict[str, float] | None = None) -> None:
+        if geometry.size > 64:
+            raise ValueError("Дошка завелика для 64-бітного пакування позицій")
+
+        self.geometry = geometry
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        size = geometry.size
+
+        self._shifts = np.arange(size, dtype=np.uint64)
+
+        self.pagoda = center_pagoda(geometry)
+        self.pagoda_goal = int(self.pagoda.max()) if geometry.center is not None else 0
+
+        # adjacency[i, n] = 1, якщо n – сусід i
+        self.adjacency = np.zeros((size, size), dtype=np.int16)
+        for i, neighbors in enumerate(geometry.neighbors):
+            self.adjacency[i, neighbors] = 1
+
+        self.corner_mask = (self.adjacency.sum(axis=1) <= 2).astype(np.int16)
+
+        jump_cells = np.array(geometry.jump_cells, dtype=np.intp).reshape(-1, 3)
+        self._src = jump_cells[:, 0]
+        self._mid = jump_cells[:, 1]
+        self._dst = jump_cells[:, 2]
+
+        self._weight_vector = np.array(
+            [self.weights.get(name, 0.0) for name in FEATURES], dtype=np.float64
+        )
+
+    # --- перетворення --- #
+
+    def to_array(self, positions) -> np.ndarray:
+        """Бітові маски -> масив (N, size) з 0/1 (uint8)."""
+        bits = np.fromiter(positions, dtype=np.uint64)
+        return ((bits[:, None] >> self._shifts) & np.uint64(1)).astype(np.uint8)
+
+    # --- ознаки --- #
+
+    def features(self, pegs: np.ndarray) -> np.ndarray:
+        """Масив (N, len(FEATURES)) у порядку FEATURES."""
+        pegs16 = pegs.astype(np.int16)
+
+        pagoda = pegs16 @ self.pagoda - self.pagoda_goal
+
+        neighbor_pegs = pegs16 @ self.adjacency
+        isolated = (pegs16 * (neighbor_pegs == 0)).sum(axis=1)
+
+        corners = pegs16 @ self.corner_mask
+
+        occupied = pegs.astype(bool)
+        legal = occupied[:, self._src] & occupied[:, self._mid] & ~occupied[:, self._dst]
+        mobility = legal.sum(axis=1)
+
+        return np.stack([pagoda, isolated, corners, mobility], axis=1).astype(np.float64)
+
+    def score(self, pegs: np.ndarray) -> np.ndarray:
+        """Оцінка кожної позиції пакета: зважена сума ознак, shape (N,)."""
+        if len(pegs) == 0:
+            return np.zeros(0)
+        return self.features(pegs) @ self._weight_vector
+
+    def score_bits(self, positions) -> np.ndarray:
+        return self.score(self.to_array(positions))
+
+    # --- вибір ходу --- #
+
+    def best_jumps(self, bits: int, jumps: list[int]) -> list[int]:
+        """Стрибки з найкращою оцінкою позиції після них (нічиї – усі)."""
+        if not jumps:
+            return []
+        checks = self.geometry.jump_checks
+        scores = self.score_bits(bits ^ checks[j][2] for j in jumps)
+        best = scores.max()
+        return [j for j, s in zip(jumps, scores) if s >= best - 1e-9]
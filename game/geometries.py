@@ -0,0 +1,86 @@
+"""
+Реєстр геометрій дошки.
+
+Кожна геометрія будується один раз (при першому зверненні) і далі
+береться з кешу разом з таблицями сусідів і стрибків.
+Гра використовує config.BOARD_GEOMETRY; "custom" – маска з config.BOARD_MASK.
+"""
+
+from config import *
+from game.position import Geometry
+
+# напрямки для трикутної дошки, записаної «сходинками» в квадратній сітці
+TRIANGULAR_DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1))
+
+
+def _cross_mask(size: int, arm: int) -> list[list[int]]:
+    """Хрест: квадрат size x size без кутів, ширина рукава arm."""
+    lo = (size - arm) // 2
+    hi = lo + arm
+    return [
+        [1 if lo <= r < hi or lo <= c < hi else 0 for c in range(size)]
+        for r in range(size)
+    ]
+
+
+ENGLISH_MASK = _cross_mask(7, 3)
+
+FRENCH_MASK = [
+    [0, 0, 1, 1, 1, 0, 0],
+    [0, 1, 1, 1, 1, 1, 0],
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [0, 1, 1, 1, 1, 1, 0],
+    [0, 0, 1, 1, 1, 0, 0],
+]
+
+GERMAN_MASK = _cross_mask(9, 3)
+
+DIAMOND_MASK = [
+    [1 if abs(r - 4) + abs(c - 4) <= 4 else 0 for c in range(9)]
+    for r in range(9)
+]
+
+TRIANGULAR_MASK = [[1 if c <= r else 0 for c in range(5)] for r in range(5)]
+
+# назва -> параметри Geometry
+_SPECS: dict[str, dict] = {
+    "english": {"mask": ENGLISH_MASK},
+    "french": {"mask": FRENCH_MASK, "start_hole": (2, 3)},
+    "german": {"mask": GERMAN_MASK},
+    "diamond": {"mask": DIAMOND_MASK},
+    "triangular": {
+        "mask": TRIANGULAR_MASK,
+        "directions": TRIANGULAR_DIRECTIONS,
+        "center": (2, 1),
+        "start_hole": (0, 0),
+    },
+    "custom": {"mask": BOARD_MASK},
+}
+
+_cache: dict[str, Geometry] = {}
+
+
+def register_geometry(name: str, mask, **options) -> Geometry:
+    """Додати (або замінити) геометрію з власною маскою."""
+    _SPECS[name] = {"mask": mask, **options}
+    _cache.pop(name, None)
+    return get_geometry(name)
+
+
+def get_geometry(name: str) -> Geometry:
+    geometry = _cache.get(name)
+    if geometry is None:
+        spec = _SPECS.get(name)
+        if spec is None:
+            raise KeyError(f"Невідома геометрія дошки: {name}")
+        geometry = _cache[name] = Geometry(name=name, **spec)
+    return geometry
+
+
+def geometry_names() -> list[str]:
+    return list(_SPECS)
+
+
+DEFAULT_GEOMETRY = get_geometry(BOARD_GEOMETRY)
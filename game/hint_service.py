@@ -0,0 +1,177 @@
+"""
+Підказки в окремому процесі.
+
+Game просить підказку (request), а результат приходить пізніше подією
+HINT_READY_EVENT з полями request, bits, jump. Пошук іде в процесі-воркері
+(у потоці він тримав би GIL і гальмував кадри). Новий запит або cancel()
+зупиняють попередній пошук: розв'язувач воркера звіряє свій номер запиту
+зі спільним лічильником кожні CHECK_EVERY вузлів.
+
+Порядок вибору ходу:
+1. перший хід розв'язку (Solver, не більше HINT_SEARCH_NODES вузлів);
+   якщо пагода вже доводить програш, пошук не запускається
+2. якщо розв'язку немає або бюджет вичерпано – pick_hint_jump
+   (таблиця виграшних позицій + оцінка Evaluator)
+"""
+
+import multiprocessing
+import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pygame
+
+from config import *
+from game.board import pick_hint_jump
+from game.geometries import geometry_names, get_geometry
+from game.pagoda import get_pagoda_set
+from game.position import Geometry
+from game.solver import Solver
+
+# подія з готовою підказкою
+HINT_READY_EVENT = pygame.event.custom_type()
+
+# як часто (у вузлах) пошук перевіряє, чи запит ще актуальний
+CHECK_EVERY = 1024
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class _HintSolver(Solver):
+    """Solver, який можна перервати ззовні і який має ліміт вузлів."""
+
+    def __init__(self, geometry: Geometry, latest) -> None:
+        super().__init__(geometry)
+        # спільний з GUI номер останнього запиту (multiprocessing.Value)
+        self.latest = latest
+        self.request_id = 0
+        self.limit = 0
+
+    def _search(self, bits: int, path: list[int]) -> bool:
+        if self.nodes % CHECK_EVERY == 0:
+            if self.latest.value != self.request_id:
+                raise _Cancelled
+            if self.nodes >= self.limit:
+                raise _BudgetExceeded
+        return super()._search(bits, path)
+
+
+# стан процесу-воркера (заповнюється ініціалізатором пулу)
+_worker: _HintSolver | None = None
+_worker_pagodas = None
+_worker_rng = random.Random()
+
+
+def _init_worker(geometry: Geometry, latest) -> None:
+    global _worker, _worker_pagodas
+    # на слабких машинах кадри GUI важливіші за швидкість підказки
+    if hasattr(os, "nice"):
+        os.nice(HINT_WORKER_NICE)
+    # зареєстрована дошка – той самий об'єкт, що й DEFAULT_GEOMETRY
+    # (від цього залежить, чи підказка бере таблицю виграшних позицій)
+    if geometry.name in geometry_names():
+        geometry = get_geometry(geometry.name)
+    _worker = _HintSolver(geometry, latest)
+    _worker_pagodas = get_pagoda_set(geometry)
+
+
+def _compute(request_id: int, bits: int, node_budget: int, from_start: bool) -> int | None:
+    solver = _worker
+    g = solver.geometry
+    if solver.latest.value != request_id or not g.has_legal_jump(bits):
+        return None
+    if _worker_pagodas.is_lost(bits):
+        return pick_hint_jump(g, bits, _worker_rng, from_start)
+
+    solver.request_id = request_id
+    solver.nodes = 0
+    solver.limit = node_budget
+    try:
+        path = solver.solve(bits)
+    except _Cancelled:
+        return None
+    except _BudgetExceeded:
+        path = None
+    if path:
+        return path[0]
+    return pick_hint_jump(g, bits, _worker_rng, from_start)
+
+
+class HintService:
+    """
+    Один процес-воркер на гру. Розв'язувач воркера з його таблицею
+    програшних позицій живе між запитами: перервані пошуки заносять до неї
+    лише повністю розібрані позиції, тож наступні підказки рахуються швидше.
+    """
+
+    def __init__(self, geometry: Geometry, node_budget: int = HINT_SEARCH_NODES) -> None:
+        self.geometry = geometry
+        self.node_budget = node_budget
+        # spawn: GUI-процес має потоки SDL і автозбереження, fork з ними небезпечний
+        self._ctx = multiprocessing.get_context("spawn")
+        self._latest = self._ctx.Value("q", 0, lock=False)
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def latest(self) -> int:
+        """Номер останнього запиту; відповіді на старіші – застарілі."""
+        return self._latest.value
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(self.geometry, self._latest),
+            )
+        return self._executor
+
+    def request(self, bits: int, from_start: bool = True) -> int:
+        """
+        Запустити пошук підказки для позиції. Повертає номер запиту.
+        from_start – партія йде від стандартного старту (див. pick_hint_jump).
+        """
+        self._latest.value += 1
+        request_id = self._latest.value
+        args = (_compute, request_id, bits, self.node_budget, from_start)
+        try:
+            future = self._get_executor().submit(*args)
+        except BrokenProcessPool:
+            # воркер упав – піднімаємо новий
+            self._executor = None
+            future = self._get_executor().submit(*args)
+        future.add_done_callback(lambda f: self._done(request_id, bits, f))
+        return request_id
+
+    def cancel(self) -> None:
+        """Скасувати поточний запит (гравець походив, відкотив хід тощо)."""
+        self._latest.value += 1
+
+    def close(self) -> None:
+        self._latest.value += 1
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _done(self, request_id: int, bits: int, future: Future) -> None:
+        # викликається в службовому потоці пулу
+        if future.cancelled():
+            return
+        try:
+            j = future.result()
+        except Exception as e:
+            print(f"⚠ Підказку не пораховано: {e}")
+            return
+        if j is None or request_id != self._latest.value:
+            return
+        pygame.event.post(
+            pygame.event.Event(HINT_READY_EVENT, request=request_id, bits=bits, jump=j)
+        )
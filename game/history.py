@@ -0,0 +1,206 @@
+"""
+Компактна історія ходів: один байт на хід – номер стрибка в таблиці геометрії.
+
+Формат файлу (little-endian):
+- magic b"PEGH", версія (1 байт)
+- довжина назви геометрії (1 байт) + назва (utf-8)
+- стартова позиція: (кількість клітинок + 7) // 8 байт
+- кількість ходів (uint16) + самі ходи
+Повна англійська партія (31 хід) займає 43 байти.
+
+Архів партій – записи to_bytes() підряд; read_record() читає їх по одному
+з потоку, не вантажачи весь файл.
+"""
+
+import struct
+
+from game.geometries import get_geometry
+from game.position import Geometry
+
+MAGIC = b"PEGH"
+VERSION = 1
+
+# кожні CHECKPOINT_EVERY ходів запам'ятовується позиція для швидкого seek
+CHECKPOINT_EVERY = 8
+
+
+class MoveHistory:
+    """
+    Ходи [0, cursor) зіграні, [cursor, len(moves)) – хвіст для redo.
+    len(history) – кількість зіграних ходів.
+    """
+
+    def __init__(self, geometry: Geometry, start_bits: int | None = None) -> None:
+        if len(geometry.jumps) > 256:
+            raise ValueError("Номер стрибка не вміщується в байт")
+
+        self.geometry = geometry
+        self.start_bits = geometry.start_bits() if start_bits is None else start_bits
+        self.moves = bytearray()
+        self.cursor = 0
+        # checkpoints[k] – позиція після k * CHECKPOINT_EVERY ходів
+        self._checkpoints: list[int] = [self.start_bits]
+
+    # --- послідовність --- #
+
+    def __len__(self) -> int:
+        return self.cursor
+
+    def __iter__(self):
+        return iter(self.moves[:self.cursor])
+
+    def __getitem__(self, i):
+        return self.moves[:self.cursor][i]
+
+    def can_undo(self) -> bool:
+        return self.cursor > 0
+
+    def can_redo(self) -> bool:
+        return self.cursor < len(self.moves)
+
+    # --- зміни --- #
+
+    def push(self, j: int, bits_after: int | None = None) -> None:
+        """Новий хід; хвіст redo відкидається."""
+        del self.moves[self.cursor:]
+        # контрольні точки з відкинутого хвоста більше не дійсні
+        del self._checkpoints[self.cursor // CHECKPOINT_EVERY + 1:]
+
+        self.moves.append(j)
+        self.cursor += 1
+        if self.cursor % CHECKPOINT_EVERY == 0:
+            if bits_after is None:
+                bits_after = self.bits_at(self.cursor)
+            self._checkpoints.append(bits_after)
+
+    def undo(self) -> int | None:
+        if not self.cursor:
+            return None
+        self.cursor -= 1
+        return self.moves[self.cursor]
+
+    def redo(self) -> int | None:
+        if self.cursor >= len(self.moves):
+            return None
+        j = self.moves[self.cursor]
+        self.cursor += 1
+        return j
+
+    def seek(self, n: int) -> int:
+        """Перейти до стану після n ходів (у межах redo-хвоста). Повертає позицію."""
+        n = max(0, min(n, len(self.moves)))
+        self.cursor = n
+        return self.bits_at(n)
+
+    def bits_at(self, n: int) -> int:
+        """Позиція після n ходів: найближча контрольна точка + доігравання."""
+        k = min(n // CHECKPOINT_EVERY, len(self._checkpoints) - 1)
+        bits = self._checkpoints[k]
+        checks = self.geometry.jump_checks
+        for j in self.moves[k * CHECKPOINT_EVERY:n]:
+            bits ^= checks[j][2]
+        return bits
+
+    def _rebuild_checkpoints(self) -> None:
+        self._checkpoints = [self.start_bits]
+        bits = self.start_bits
+        checks = self.geometry.jump_checks
+        for i, j in enumerate(self.moves, 1):
+            bits ^= checks[j][2]
+            if i % CHECKPOINT_EVERY == 0:
+                self._checkpoints.append(bits)
+
+    # --- серіалізація --- #
+
+    def to_bytes(self) -> bytes:
+        """Зберігаються лише зіграні ходи (без redo-хвоста)."""
+        name = self.geometry.name.encode()
+        start_len = (self.geometry.size + 7) // 8
+        moves = bytes(self.moves[:self.cursor])
+        return b"".join(
+            (
+                MAGIC,
+                struct.pack("<BB", VERSION, len(name)),
+                name,
+                self.start_bits.to_bytes(start_len, "little"),
+                struct.pack("<H", len(moves)),
+                moves,
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, geometry: Geometry | None = None) -> "MoveHistory":
+        """ValueError – запис обрізаний, пошкоджений або для невідомої дошки."""
+        if data[:4] != MAGIC or len(data) < 6:
+            raise ValueError("Не файл історії ходів")
+        version, name_len = struct.unpack_from("<BB", data, 4)
+        if version != VERSION:
+            raise ValueError(f"Непідтримувана версія історії: {version}")
+
+        offset = 6
+        name = data[offset:offset + name_len].decode()
+        offset += name_len
+        if geometry is None:
+            try:
+                geometry = get_geometry(name)
+            except KeyError as e:
+                raise ValueError(e.args[0]) from None
+
+        start_len = (geometry.size + 7) // 8
+        if len(data) < offset + start_len + 2:
+            raise ValueError("Історія ходів обрізана")
+        start_bits = int.from_bytes(data[offset:offset + start_len], "little")
+        if start_bits & ~geometry.full:
+            raise ValueError("Стартова позиція поза дошкою")
+        offset += start_len
+        (count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        moves = data[offset:offset + count]
+        if len(moves) != count:
+            raise ValueError("Історія ходів обрізана")
+        if moves and max(moves) >= len(geometry.jumps):
+            raise ValueError(f"Невідомий стрибок {max(moves)}")
+
+        history = cls(geometry, start_bits)
+        history.moves = bytearray(moves)
+        history.cursor = count
+        history._rebuild_checkpoints()
+        return history
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, geometry: Geometry | None = None) -> "MoveHistory":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), geometry)
+
+
+def read_record(f) -> bytes | None:
+    """
+    Сирі байти наступного запису з двійкового потоку; None – кінець архіву.
+    ValueError – запис обрізаний або пошкоджений (далі потік не читається:
+    межу наступного запису вже не знайти).
+    """
+    header = f.read(6)
+    if not header:
+        return None
+    if len(header) < 6 or header[:4] != MAGIC:
+        raise ValueError("Архів пошкоджено: очікувався запис історії ходів")
+    if header[4] != VERSION:
+        raise ValueError(f"Непідтримувана версія історії: {header[4]}")
+    name = f.read(header[5])
+    try:
+        geometry = get_geometry(name.decode())
+    except KeyError as e:
+        raise ValueError(e.args[0]) from None
+    start = f.read((geometry.size + 7) // 8)
+    count_bytes = f.read(2)
+    if len(start) < (geometry.size + 7) // 8 or len(count_bytes) < 2:
+        raise ValueError("Історія ходів обрізана")
+    (count,) = struct.unpack("<H", count_bytes)
+    moves = f.read(count)
+    if len(moves) < count:
+        raise ValueError("Історія ходів обрізана")
+    return b"".join((header, name, start, count_bytes, moves))
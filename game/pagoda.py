@@ -0,0 +1,169 @@
+"""
+Пагода-функції: ваги клітинок p, для яких кожен стрибок не збільшує суму,
+тобто p(source) + p(middle) >= p(target).
+
+Тоді P(позиція) = сума p по фішках ніколи не зростає, і якщо
+P(позиція) < P(ціль), ціль уже недосяжна – без жодного перебору.
+Перевірка – кілька табличних звертань за байтами маски.
+
+Для кожної клітинки-цілі бібліотека будує пагоди з числами Фібоначчі:
+- за відстанню до цілі в кроках між сусідами
+- лише за номером рядка і лише за номером стовпця
+Кожна пагода перевіряється validate_pagoda; додаткові можна
+зареєструвати для геометрії через register_pagoda.
+"""
+
+from collections import deque
+
+from game.position import Geometry
+
+# назва геометрії -> додаткові пагоди {клітинка: вага}
+_extra_pagodas: dict[str, list[dict[tuple[int, int], int]]] = {}
+
+
+def register_pagoda(geometry_name: str, weights: dict[tuple[int, int], int]) -> None:
+    _extra_pagodas.setdefault(geometry_name, []).append(dict(weights))
+
+
+def validate_pagoda(geometry: Geometry, weights: list[int]) -> bool:
+    """True, якщо жоден стрибок не збільшує суму ваг."""
+    return all(
+        weights[s] + weights[m] >= weights[t] for s, m, t in geometry.jump_cells
+    )
+
+
+def _fibonacci_weights(distances: list[int]) -> list[int]:
+    """Вага клітинки = F(far - d): крок до цілі – рівність Фібоначчі."""
+    far = max(d for d in distances if d >= 0)
+    fib = [1, 1]
+    while len(fib) <= far + 1:
+        fib.append(fib[-1] + fib[-2])
+    return [fib[far - d] if d >= 0 else 0 for d in distances]
+
+
+def _graph_distances(geometry: Geometry, target: int) -> list[int]:
+    dist = [-1] * geometry.size
+    dist[target] = 0
+    queue = deque([target])
+    while queue:
+        i = queue.popleft()
+        for n in geometry.neighbors[i]:
+            if dist[n] < 0:
+                dist[n] = dist[i] + 1
+                queue.append(n)
+    return dist
+
+
+def _line_pagodas(offsets: list[int]) -> list[list[int]]:
+    """Одновимірні пагоди вздовж рядка/стовпця: пік Фібоначчі, парність, константа."""
+    return [
+        _fibonacci_weights([abs(d) for d in offsets]),
+        [1 - abs(d) % 2 for d in offsets],
+        [1] * len(offsets),
+    ]
+
+
+def fibonacci_pagodas(geometry: Geometry, target: int) -> list[list[int]]:
+    """Пагоди з вершиною в клітинці target (лише ті, що пройшли перевірку)."""
+    tr, tc = geometry.cells[target]
+    candidates = [_fibonacci_weights(_graph_distances(geometry, target))]
+    # добуток невід'ємних пагод рядка і стовпця – теж пагода (для стрибків
+    # по рядку чи стовпцю множник іншої осі однаковий для всіх трьох клітинок)
+    rows = _line_pagodas([r - tr for r, _ in geometry.cells])
+    cols = _line_pagodas([c - tc for _, c in geometry.cells])
+    for row_weights in rows:
+        for col_weights in cols:
+            if row_weights is rows[-1] and col_weights is cols[-1]:
+                continue  # усі ваги 1 – лише «є хоч одна фішка»
+            candidates.append([a * b for a, b in zip(row_weights, col_weights)])
+    result = []
+    for weights in candidates:
+        if validate_pagoda(geometry, weights) and weights not in result:
+            result.append(weights)
+    return result
+
+
+class _Pagoda:
+    """Ваги + таблиці сум за байтами маски."""
+
+    def __init__(self, geometry: Geometry, weights: list[int]) -> None:
+        self.weights = weights
+        chunks = (geometry.size + 7) // 8
+        self.tables = []
+        for k in range(chunks):
+            # table[byte] – сума ваг бітів byte; подвоюємо таблицю на кожен біт
+            table = [0]
+            for w in (weights[8 * k:8 * k + 8] + [0] * 8)[:8]:
+                table += [v + w for v in table]
+            self.tables.append(table)
+
+    def value(self, bits: int) -> int:
+        total = 0
+        for table in self.tables:
+            total += table[bits & 255]
+            bits >>= 8
+        return total
+
+
+# (id геометрії, ціль) -> PagodaSet; таблиці спільні для Board, підказок і Solver
+_sets: dict[tuple[int, tuple[int, int] | None], "PagodaSet"] = {}
+
+
+def get_pagoda_set(geometry: Geometry, goal: tuple[int, int] | None = None) -> "PagodaSet":
+    pagodas = _sets.get((id(geometry), goal))
+    if pagodas is None or pagodas.geometry is not geometry:
+        pagodas = _sets[(id(geometry), goal)] = PagodaSet(geometry, goal)
+    return pagodas
+
+
+class PagodaSet:
+    """
+    Доказ програшу для цілі:
+    goal=(r, c) – остання фішка в клітинці; goal=None – будь-де.
+
+        pagodas = PagodaSet(geometry, goal)
+        pagodas.is_lost(bits)   # True – ціль точно недосяжна
+    False не означає, що ціль досяжна: пагода дає лише необхідну умову.
+    """
+
+    def __init__(self, geometry: Geometry, goal: tuple[int, int] | None = None) -> None:
+        self.geometry = geometry
+        self.goal = goal
+
+        extra = []
+        for cell_weights in _extra_pagodas.get(geometry.name, []):
+            weights = [cell_weights.get(cell, 0) for cell in geometry.cells]
+            if not validate_pagoda(geometry, weights):
+                raise ValueError(f"{geometry.name}: зареєстрована пагода не є пагодою")
+            extra.append(weights)
+
+        # targets[i] – (клітинка-ціль, [(пагода, мінімальна сума)])
+        self.targets: list[tuple[int, list[tuple[_Pagoda, int]]]] = []
+        cells = [geometry.index[goal]] if goal is not None else range(geometry.size)
+        for t in cells:
+            checks = [
+                (_Pagoda(geometry, weights), weights[t])
+                for weights in fibonacci_pagodas(geometry, t) + extra
+            ]
+            self.targets.append((t, checks))
+        # з якої цілі почати перевірку (остання, що вижила)
+        self._last = 0
+
+    def target_possible(self, bits: int, k: int) -> bool:
+        _, checks = self.targets[k]
+        for pagoda, need in checks:
+            if pagoda.value(bits) < need:
+                return False
+        return True
+
+    def is_lost(self, bits: int) -> bool:
+        """True, якщо жодна з цілей уже недосяжна (доведено пагодою)."""
+        if bits == 0:
+            return True
+        n = len(self.targets)
+        for step in range(n):
+            k = (self._last + step) % n
+            if self.target_possible(bits, k):
+                self._last = k
+                return False
+        return True
@@ -0,0 +1,318 @@
+"""
+Паралельний розв'язувач для великих і довільних дошок.
+
+Дерево пошуку розрізається на невеликій глибині, піддерева йдуть на
+ProcessPoolExecutor. Програшні позиції воркери пишуть у спільну таблицю
+в shared_memory (пряма адресація, ключ перевіряється, тож хибних
+«програшних» не буває – лише витіснення). Координатор живе в окремому
+потоці, тому GUI може запустити пошук, читати progress() і скасувати його.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from game.geometries import DEFAULT_GEOMETRY
+from game.position import Geometry
+from game.solver import Solver
+
+# як часто (у вузлах) воркер звітує лічильники і перевіряє скасування
+REPORT_EVERY = 4096
+
+_HASH_MUL = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class SharedDeadTable:
+    """Таблиця програшних позицій у спільній пам'яті: 2**bits слотів uint64."""
+
+    def __init__(self, bits: int = 22, name: str | None = None) -> None:
+        self.bits = bits
+        self._shift = 64 - bits
+        size = (1 << bits) * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._slots = self._shm.buf.cast("Q")
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _slot(self, key: int) -> int:
+        return (key * _HASH_MUL & _MASK64) >> self._shift
+
+    def __contains__(self, key: int) -> bool:
+        # 0 – порожній слот, тому зберігаємо key + 1
+        return self._slots[self._slot(key)] == key + 1
+
+    def add(self, key: int) -> None:
+        self._slots[self._slot(key)] = key + 1
+
+    def close(self) -> None:
+        self._slots.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _WorkerSolver(Solver):
+    """Solver воркера: локальна таблиця + спільна, лічильники і скасування."""
+
+    def __init__(self, geometry, goal, table, cancel_event, counters) -> None:
+        super().__init__(geometry, goal)
+        self.table = table
+        self.cancel_event = cancel_event
+        self.counters = counters
+        self.hits = 0
+        self._reported_nodes = 0
+        self._reported_hits = 0
+
+    def report(self) -> None:
+        with self.counters.get_lock():
+            self.counters[0] += self.nodes - self._reported_nodes
+            self.counters[1] += self.hits - self._reported_hits
+        self._reported_nodes = self.nodes
+        self._reported_hits = self.hits
+
+    def _search(self, bits: int, path: list[int]) -> bool:
+        self.nodes += 1
+        if self.nodes % REPORT_EVERY == 0:
+            self.report()
+            if self.cancel_event.is_set():
+                raise _Cancelled
+
+        if bits & (bits - 1) == 0:
+            return self.goal_bits is None or bits == self.goal_bits
+
+        if self.pagodas is not None and self.pagodas.is_lost(bits):
+            return False
+
+        key = self.symmetries.canonical(bits)
+        if key in self.dead:
+            self.hits += 1
+            return False
+        if key in self.table:
+            self.hits += 1
+            self.dead.add(key)
+            return False
+
+        for j, (need, target, flip) in enumerate(self.geometry.jump_checks):
+            if bits & need == need and not bits & target:
+                path.append(j)
+                if self._search(bits ^ flip, path):
+                    return True
+                path.pop()
+
+        self.dead.add(key)
+        self.table.add(key)
+        return False
+
+
+# стан процесу-воркера (заповнюється ініціалізатором пулу)
+_worker: _WorkerSolver | None = None
+
+
+def _init_worker(geometry, goal, table_name, table_bits, cancel_event, counters) -> None:
+    global _worker
+    table = SharedDeadTable(table_bits, name=table_name)
+    _worker = _WorkerSolver(geometry, goal, table, cancel_event, counters)
+
+
+def _solve_subtree(bits: int) -> list[int] | None:
+    try:
+        return _worker.solve(bits)
+    except _Cancelled:
+        return None
+    finally:
+        _worker.report()
+
+
+class ParallelSolver:
+    """
+    Використання з GUI:
+        solver = ParallelSolver(geometry)
+        solver.start(bits)          # не блокує
+        solver.progress()           # вузли/с, влучання в таблицю, піддерева
+        solver.cancel()
+        solver.result()             # список стрибків або None
+    """
+
+    def __init__(
+        self,
+        geometry: Geometry = DEFAULT_GEOMETRY,
+        goal: tuple[int, int] | None = None,
+        workers: int | None = None,
+        table_bits: int = 22,
+        tasks_per_worker: int = 8,
+    ) -> None:
+        if geometry.size > 63:
+            raise ValueError("Дошка завелика для 64-бітної спільної таблиці")
+
+        self.geometry = geometry
+        self.goal = goal
+        self.workers = workers or os.cpu_count() or 1
+        self.table_bits = table_bits
+        self.tasks_per_worker = tasks_per_worker
+
+        # spawn: пул створюється з GUI-процесу, де вже працюють потоки SDL,
+        # підказок і автозбереження – fork з ними небезпечний
+        self._ctx = multiprocessing.get_context("spawn")
+        # _cancel_event зупиняє воркерів (і коли розв'язок уже знайдено),
+        # _user_cancel – лише скасування ззовні
+        self._cancel_event = self._ctx.Event()
+        self._user_cancel = threading.Event()
+        self._counters = self._ctx.Array("q", 2)
+
+        self._thread: threading.Thread | None = None
+        self._done = threading.Event()
+        self._result: list[int] | None = None
+        self._error: BaseException | None = None
+        self._started_at = 0.0
+        self._tasks_total = 0
+        self._tasks_done = 0
+
+    # --- розбиття --- #
+
+    def _split(self, bits: int) -> list[tuple[list[int], int]]:
+        """
+        Розгортаємо дерево вшир, доки вузлів не стане достатньо для всіх воркерів.
+        Симетричні вузли зливаються, щоб одне піддерево не рахувалось двічі.
+        """
+        symmetries = Solver(self.geometry, self.goal).symmetries
+        want = self.workers * self.tasks_per_worker
+        frontier = [([], bits)]
+
+        while len(frontier) < want:
+            next_frontier = []
+            seen = set()
+            for prefix, b in frontier:
+                for j in self.geometry.legal_jumps(b):
+                    child = self.geometry.apply_jump(b, j)
+                    key = symmetries.canonical(child)
+                    if key not in seen:
+                        seen.add(key)
+                        next_frontier.append((prefix + [j], child))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return frontier
+
+    # --- керування --- #
+
+    def start(self, bits: int) -> None:
+        self._cancel_event.clear()
+        self._user_cancel.clear()
+        self._done.clear()
+        self._result = None
+        self._error = None
+        with self._counters.get_lock():
+            self._counters[0] = 0
+            self._counters[1] = 0
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(bits,), daemon=True)
+        self._thread.start()
+
+    def solve(self, bits: int) -> list[int] | None:
+        """Блокуючий варіант: start + result."""
+        self.start(bits)
+        return self.result()
+
+    def cancel(self) -> None:
+        self._user_cancel.set()
+        self._cancel_event.set()
+
+    def cancelled(self) -> bool:
+        return self._user_cancel.is_set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: float | None = None) -> list[int] | None:
+        if not self._done.wait(timeout):
+            raise TimeoutError("Пошук ще триває")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def progress(self) -> dict:
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        with self._counters.get_lock():
+            nodes, hits = self._counters[0], self._counters[1]
+        return {
+            "nodes": nodes,
+            "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+            "table_hit_rate": hits / nodes if nodes else 0.0,
+            "tasks_done": self._tasks_done,
+            "tasks_total": self._tasks_total,
+            "elapsed_sec": elapsed,
+            "done": self.done(),
+        }
+
+    def _run(self, bits: int) -> None:
+        table = SharedDeadTable(self.table_bits)
+        try:
+            self._result = self._search(bits, table)
+        except BaseException as e:
+            self._error = e
+        finally:
+            table.close()
+            self._done.set()
+
+    def _search(self, bits: int, table: SharedDeadTable) -> list[int] | None:
+        if bits & (bits - 1) == 0:
+            solver = Solver(self.geometry, self.goal)
+            return solver.solve(bits)
+
+        tasks = self._split(bits)
+        self._tasks_total = len(tasks)
+        self._tasks_done = 0
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._ctx,
+            initializer=_init_worker,
+            initargs=(
+                self.geometry,
+                self.goal,
+                table.name,
+                self.table_bits,
+                self._cancel_event,
+                self._counters,
+            ),
+        )
+        try:
+            pending = {
+                executor.submit(_solve_subtree, child): prefix
+                for prefix, child in tasks
+            }
+            while pending:
+                finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    prefix = pending.pop(future)
+                    self._tasks_done += 1
+                    path = future.result()
+                    # воркери бачать скасування лише раз на REPORT_EVERY вузлів,
+                    # тож коротке піддерево могло дорахуватись уже після cancel()
+                    if self._user_cancel.is_set():
+                        return None
+                    if path is not None:
+                        # знайдено – решту піддерев зупиняємо
+                        self._cancel_event.set()
+                        return prefix + path
+                if self._user_cancel.is_set():
+                    return None
+            return None
+        finally:
+            self._cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,49 +1,85 @@
+from functools import lru_cache
+
 import pygame
 from config import *
+from game.assets import AssetCache
+
+
+@lru_cache(maxsize=None)
+def pixel_centers(origin: tuple[int, int], rows: int, cols: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """centers[row][col] – піксельний центр клітинки; одна таблиця на розкладку дошки."""
+    ox, oy = origin
+    half = CELL_SIZE // 2
+    return tuple(
+        tuple((ox + c * CELL_SIZE + half, oy + r * CELL_SIZE + half) for c in range(cols))
+        for r in range(rows)
+    )
 
 
 class Peg:
     """
-    Одна фішка на дошці.
+    Одна фішка на дошці – легкий запис без __dict__.
     row / col – позиція в сітці.
-    x / y – піксельні координати (рахуються автоматично).
+    x / y – піксельний центр з таблиці pixel_centers (нічого не перераховується при ході).
     """
 
-    def __init__(self, row: int, col: int, state: str = "base"):
+    __slots__ = ("row", "col", "state", "centers")
+
+    # розмір беремо з конфігу, щоб узгодити з отворами
+    radius = PEG_RADIUS
+
+    def __init__(
+        self,
+        row: int,
+        col: int,
+        state: str = "base",
+        centers: tuple | None = None,
+    ):
         self.row = row
         self.col = col
-        # розмір беремо з конфігу, щоб узгодити з отворами
-        self.radius = PEG_RADIUS
         self.state = state  # 'base', 'selected', 'hint'
-        self.visible = True
-        self.update_pixel_position()
+        if centers is None:
+            centers = pixel_centers((BOARD_OFFSET_X, BOARD_OFFSET_Y), BOARD_ROWS, BOARD_COLS)
+        self.centers = centers
 
     # --- позиціонування --- #
 
-    def update_pixel_position(self) -> None:
-        self.x = BOARD_OFFSET_X + self.col * CELL_SIZE + CELL_SIZE // 2
-        self.y = BOARD_OFFSET_Y + self.row * CELL_SIZE + CELL_SIZE // 2
+    @property
+    def x(self) -> int:
+        return self.centers[self.row][self.col][0]
 
-    # --- рендеринг --- #
+    @property
+    def y(self) -> int:
+        return self.centers[self.row][self.col][1]
 
-    def draw(self, screen: pygame.Surface, images: dict) -> None:
-        if not self.visible:
-            return
+    def move_to(self, row: int, col: int) -> None:
+        self.row = row
+        self.col = col
+
+    # --- рендеринг --- #
 
-        if self.state == "selected" and "peg_selected" in images:
+    def blit_args(self, assets: AssetCache) -> tuple | None:
+        """(поверхня, позиція, area) для Surface.blits; None – текстури немає."""
+        if self.state == "selected" and "peg_selected" in assets:
             key = "peg_selected"
-        elif self.state == "hint" and "peg_hint" in images:
+        elif self.state == "hint" and "peg_hint" in assets:
             key = "peg_hint"
-        elif "peg_base" in images:
+        elif "peg_base" in assets:
             key = "peg_base"
         else:
-            self._draw_fallback(screen)
-            return
+            return None
 
         size = self.radius * 2
-        image = pygame.transform.smoothscale(images[key], (size, size))
-        rect = image.get_rect(center=(self.x, self.y))
-        screen.blit(image, rect)
+        image, area = assets.sprite(key, (size, size))
+        x, y = self.centers[self.row][self.col]
+        return image, (x - self.radius, y - self.radius), area
+
+    def draw(self, screen: pygame.Surface, assets: AssetCache) -> None:
+        blit = self.blit_args(assets)
+        if blit is None:
+            self._draw_fallback(screen)
+            return
+        screen.blit(*blit)
 
     def _draw_fallback(self, screen: pygame.Surface) -> None:
         if self.state == "selected":
@@ -52,30 +88,15 @@ class Peg:
             color = GREEN
         else:
             color = DARK_GRAY
-        pygame.draw.circle(screen, color, (self.x, self.y), self.radius)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y), self.radius, 2)
+        center = self.centers[self.row][self.col]
+        pygame.draw.circle(screen, color, center, self.radius)
+        pygame.draw.circle(screen, BLACK, center, self.radius, 2)
 
     # --- стани --- #
 
-    def contains_point(self, pos) -> bool:
-        if not self.visible:
-            return False
-        dx = pos[0] - self.x
-        dy = pos[1] - self.y
-        return (dx * dx + dy * dy) ** 0.5 <= self.radius
-
     def set_state(self, state: str) -> None:
         if state in ("base", "selected", "hint"):
             self.state = state
 
-    def hide(self) -> None:
-        self.visible = False
-
-    def show(self) -> None:
-        self.visible = True
-
-    def is_visible(self) -> bool:
-        return self.visible
-
     def __repr__(self) -> str:
-        return f"Peg(row={self.row}, col={self.col}, state={self.state}, visible={self.visible})"
+        return f"Peg(row={self.row}, col={self.col}, state={self.state})"
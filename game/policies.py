@@ -0,0 +1,137 @@
+"""
+Політики вибору ходу для безголової симуляції та підказок.
+Працюють лише з бітовою позицією – без pygame.
+
+Політика – це виклик policy(position, rng) -> номер стрибка,
+створений фабрикою з POLICIES для конкретної геометрії.
+"""
+
+import random
+
+from game.position import Geometry, Position
+from game.solver import Solver
+
+# клас Evaluator імпортується при першій оцінці: NumPy вантажиться довго,
+# а для старту гри не потрібен. False – NumPy не встановлено
+_evaluator_class = None
+
+# один Evaluator на геометрію (таблиці ознак рахуються при створенні)
+_evaluators: dict[int, "Evaluator"] = {}
+
+
+def center_distance_moves(geometry: Geometry, jumps: list[int]) -> list[int]:
+    """Стрибки, ціль яких найближча (за Манхеттеном) до центру дошки."""
+    if geometry.center is None:
+        return list(jumps)
+
+    cr, cc = geometry.center
+    cells = geometry.cells
+    best: list[int] = []
+    best_dist = None
+    for j in jumps:
+        tr, tc = cells[geometry.jump_cells[j][2]]
+        dist = abs(tr - cr) + abs(tc - cc)
+        if best_dist is None or dist < best_dist:
+            best_dist = dist
+            best = [j]
+        elif dist == best_dist:
+            best.append(j)
+    return best
+
+
+def _get_evaluator_class():
+    global _evaluator_class
+    if _evaluator_class is None:
+        try:
+            from game.evaluator import Evaluator
+        except ImportError:  # NumPy не встановлено – лише евристика центру
+            Evaluator = False
+        _evaluator_class = Evaluator
+    return _evaluator_class
+
+
+def get_evaluator(geometry: Geometry) -> "Evaluator | None":
+    if geometry.size > 64:
+        return None
+    evaluator = _evaluators.get(id(geometry))
+    if evaluator is None or evaluator.geometry is not geometry:
+        evaluator_class = _get_evaluator_class()
+        if not evaluator_class:
+            return None
+        evaluator = _evaluators[id(geometry)] = evaluator_class(geometry)
+    return evaluator
+
+
+def best_moves(geometry: Geometry, bits: int, jumps: list[int]) -> list[int]:
+    """Стрибки з найкращою оцінкою Evaluator; без NumPy – найближчі до центру."""
+    evaluator = get_evaluator(geometry)
+    if evaluator is None:
+        return center_distance_moves(geometry, jumps)
+    return evaluator.best_jumps(bits, jumps)
+
+
+class RandomPolicy:
+    def __init__(self, geometry: Geometry) -> None:
+        self.geometry = geometry
+
+    def __call__(self, position: Position, rng: random.Random) -> int:
+        return rng.choice(position.legal_jumps())
+
+
+class CenterPolicy:
+    """Поточна евристика підказки: ціль ближче до центру, нічиї – випадково."""
+
+    def __init__(self, geometry: Geometry) -> None:
+        self.geometry = geometry
+
+    def __call__(self, position: Position, rng: random.Random) -> int:
+        return rng.choice(center_distance_moves(self.geometry, position.legal_jumps()))
+
+
+class EvalPolicy:
+    """Хід у найкраще оцінену позицію (pagoda, ізольовані, кути, мобільність)."""
+
+    def __init__(self, geometry: Geometry) -> None:
+        self.geometry = geometry
+
+    def __call__(self, position: Position, rng: random.Random) -> int:
+        return rng.choice(best_moves(self.geometry, position.bits, position.legal_jumps()))
+
+
+class SolverPolicy:
+    """
+    Хід з розв'язку, якщо позиція ще виграшна, інакше – евристика центру.
+    Знайдений розв'язок запам'ятовується як план, тож повторний пошук
+    потрібен лише тоді, коли гра з нього зійшла.
+    """
+
+    def __init__(self, geometry: Geometry, goal: tuple[int, int] | None = None) -> None:
+        self.geometry = geometry
+        self.solver = Solver(geometry, goal)
+        self.fallback = CenterPolicy(geometry)
+        self.plan: dict[int, int] = {}
+
+    def __call__(self, position: Position, rng: random.Random) -> int:
+        bits = position.bits
+        j = self.plan.get(bits)
+        if j is not None:
+            return j
+
+        path = self.solver.solve(bits)
+        if not path:
+            return self.fallback(position, rng)
+
+        self.plan.clear()
+        b = bits
+        for step in path:
+            self.plan[b] = step
+            b = self.geometry.apply_jump(b, step)
+        return path[0]
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "center": CenterPolicy,
+    "eval": EvalPolicy,
+    "solver": SolverPolicy,
+}
@@ -0,0 +1,202 @@
+class Geometry:
+    """
+    Геометрія дошки, з якої рахуються бітові таблиці:
+    - кожна дозволена клітинка маски отримує свій біт (row-major)
+    - усі стрибки зберігаються як трійки масок (source, middle, target)
+    - таблиці сусідів і стрибків рахуються один раз при створенні
+    """
+
+    DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    def __init__(
+        self,
+        mask,
+        center: tuple[int, int] | None = None,
+        directions: tuple[tuple[int, int], ...] = DIRECTIONS,
+        start_hole: tuple[int, int] | None = None,
+        name: str = "custom",
+    ) -> None:
+        self.name = name
+        self.directions = tuple(directions)
+        self.mask = [list(row) for row in mask]
+        self.rows = len(self.mask)
+        self.cols = len(self.mask[0]) if self.rows else 0
+
+        # біт i <-> клітинка cells[i]
+        self.cells: list[tuple[int, int]] = [
+            (r, c)
+            for r in range(self.rows)
+            for c in range(self.cols)
+            if self.mask[r][c] == 1
+        ]
+        self.index: dict[tuple[int, int], int] = {
+            cell: i for i, cell in enumerate(self.cells)
+        }
+        self.size = len(self.cells)
+        self.full = (1 << self.size) - 1
+
+        if center is None:
+            center = (self.rows // 2, self.cols // 2)
+        self.center = center if center in self.index else None
+        # порожній отвір на старті (за замовчуванням – центр)
+        self.start_hole = start_hole if start_hole in self.index else self.center
+
+        # neighbors[i] – сусідні клітинки i за напрямками геометрії
+        self.neighbors: list[list[int]] = [[] for _ in range(self.size)]
+
+        # трійки масок і індексів клітинок для кожного стрибка
+        self.jumps: list[tuple[int, int, int]] = []
+        self.jump_cells: list[tuple[int, int, int]] = []
+        # jumps_from[i] – номери стрибків, що починаються з клітинки i
+        self.jumps_from: list[list[int]] = [[] for _ in range(self.size)]
+        # (source, target) -> номер стрибка
+        self.jump_by_ends: dict[tuple[int, int], int] = {}
+        self._build_jumps()
+
+        # для перевірки ходу: (маска source|middle, маска target, маска xor)
+        self.jump_checks: list[tuple[int, int, int]] = [
+            (s | m, t, s | m | t) for s, m, t in self.jumps
+        ]
+
+        # стрибки, легальність яких може змінитись після стрибка j:
+        # усі, що зачіпають хоч одну з трьох його клітинок
+        touching: list[set[int]] = [set() for _ in range(self.size)]
+        for j, cells in enumerate(self.jump_cells):
+            for i in cells:
+                touching[i].add(j)
+        self.jump_affects: list[tuple[int, ...]] = [
+            tuple(sorted(touching[si] | touching[mi] | touching[ti]))
+            for si, mi, ti in self.jump_cells
+        ]
+
+    def _build_jumps(self) -> None:
+        for si, (r, c) in enumerate(self.cells):
+            for dr, dc in self.directions:
+                mi = self.index.get((r + dr, c + dc))
+                if mi is not None:
+                    self.neighbors[si].append(mi)
+
+                ti = self.index.get((r + 2 * dr, c + 2 * dc))
+                if mi is None or ti is None:
+                    continue
+
+                j = len(self.jumps)
+                self.jumps.append((1 << si, 1 << mi, 1 << ti))
+                self.jump_cells.append((si, mi, ti))
+                self.jumps_from[si].append(j)
+                self.jump_by_ends[(si, ti)] = j
+
+    # --- позиції --- #
+
+    def start_bits(self, hole: tuple[int, int] | None = None) -> int:
+        """Стартова позиція: усі отвори заповнені, крім hole (за замовчуванням – start_hole)."""
+        if hole is None:
+            hole = self.start_hole
+        if hole is None:
+            return self.full
+        return self.full & ~(1 << self.index[hole])
+
+    def legal_jumps(self, bits: int) -> list[int]:
+        return [
+            j
+            for j, (need, target, _) in enumerate(self.jump_checks)
+            if bits & need == need and not bits & target
+        ]
+
+    def has_legal_jump(self, bits: int) -> bool:
+        for need, target, _ in self.jump_checks:
+            if bits & need == need and not bits & target:
+                return True
+        return False
+
+    def apply_jump(self, bits: int, j: int) -> int:
+        """Стрибок (і його відміна) – це один xor трьох бітів."""
+        return bits ^ self.jump_checks[j][2]
+
+    def bits_from_cells(self, cells) -> int:
+        bits = 0
+        for cell in cells:
+            bits |= 1 << self.index[cell]
+        return bits
+
+    def cells_from_bits(self, bits: int) -> list[tuple[int, int]]:
+        return [cell for i, cell in enumerate(self.cells) if bits >> i & 1]
+
+    def __repr__(self) -> str:
+        return f"Geometry({self.name!r}, holes={self.size}, jumps={len(self.jumps)})"
+
+
+class Position:
+    """
+    Позиція без pygame: одне ціле число, де біт = фішка в отворі.
+    Board є лише відображенням цього стану.
+
+    Множина легальних стрибків ведеться інкрементно: стрибок змінює лише
+    три клітинки, тож перевіряються тільки стрибки через них
+    (geometry.jump_affects). Кількість ходів і кінець гри – читання за O(1).
+    """
+
+    __slots__ = ("geometry", "bits", "moves")
+
+    def __init__(self, geometry: Geometry, bits: int) -> None:
+        self.geometry = geometry
+        self.bits = bits
+        self.moves: set[int] = set(geometry.legal_jumps(bits))
+
+    @classmethod
+    def start(cls, geometry: Geometry, hole: tuple[int, int] | None = None) -> "Position":
+        return cls(geometry, geometry.start_bits(hole))
+
+    # --- запити --- #
+
+    def has_peg(self, row: int, col: int) -> bool:
+        i = self.geometry.index.get((row, col))
+        return i is not None and bool(self.bits >> i & 1)
+
+    def peg_count(self) -> int:
+        return self.bits.bit_count()
+
+    def move_count(self) -> int:
+        return len(self.moves)
+
+    def legal_jumps(self) -> list[int]:
+        return sorted(self.moves)
+
+    def jumps_from(self, row: int, col: int) -> list[int]:
+        i = self.geometry.index.get((row, col))
+        if i is None:
+            return []
+        return [j for j in self.geometry.jumps_from[i] if j in self.moves]
+
+    def has_legal_jump(self) -> bool:
+        return bool(self.moves)
+
+    # --- зміна стану --- #
+
+    def apply(self, j: int) -> None:
+        g = self.geometry
+        bits = self.bits ^ g.jump_checks[j][2]
+        self.bits = bits
+
+        moves = self.moves
+        checks = g.jump_checks
+        for k in g.jump_affects[j]:
+            need, target, _ = checks[k]
+            if bits & need == need and not bits & target:
+                moves.add(k)
+            else:
+                moves.discard(k)
+
+    def undo(self, j: int) -> None:
+        # легальність залежить лише від бітів, тож відміна – той самий перерахунок
+        self.apply(j)
+
+    def copy(self) -> "Position":
+        other = Position.__new__(Position)
+        other.geometry = self.geometry
+        other.bits = self.bits
+        other.moves = set(self.moves)
+        return other
+
+    def __repr__(self) -> str:
+        return f"Position(pegs={self.peg_count()}, bits={self.bits:#x})"
@@ -0,0 +1,190 @@
+"""
+Профілювання кадру по фазах.
+
+    with profiler.phase("draw.board"):
+        ...
+
+Кожна фаза накопичує час (мс) у поточному кадрі; end_frame() закриває
+кадр і кладе значення у кільцеві буфери на PROFILE_HISTORY кадрів.
+Звідти рахуються p50/p95/p99, графік для оверлею (F3) і експорт
+у файл або UDP-сокет (MetricsExporter).
+
+Фаза "wait" – сон у event.wait / clock.tick; у час кадру не входить.
+"""
+
+import json
+import math
+import os
+import socket
+import time
+from collections import deque
+
+import pygame
+
+from config import *
+from game.text_cache import render_text
+
+
+class _Phase:
+    """Контекст-менеджер однієї фази; створюється один раз на назву."""
+
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.add(self.name, (time.perf_counter() - self.started) * 1000)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Найближчий ранг: q у [0, 100]."""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    def __init__(self, history: int = PROFILE_HISTORY) -> None:
+        self.history = history
+        # час роботи кадру (мс) – від begin_frame до end_frame
+        self.frames: deque[float] = deque(maxlen=history)
+        self.phases: dict[str, deque[float]] = {}
+        self.frame_count = 0
+
+        self._current: dict[str, float] = {}
+        self._cache: dict[str, _Phase] = {}
+        self._frame_started = 0.0
+        self._panel: pygame.Surface | None = None
+
+    def phase(self, name: str) -> _Phase:
+        p = self._cache.get(name)
+        if p is None:
+            p = self._cache[name] = _Phase(self, name)
+        return p
+
+    def add(self, name: str, ms: float) -> None:
+        self._current[name] = self._current.get(name, 0.0) + ms
+
+    def begin_frame(self) -> None:
+        self._frame_started = time.perf_counter()
+
+    def end_frame(self) -> None:
+        self.frames.append((time.perf_counter() - self._frame_started) * 1000)
+        for name, values in self.phases.items():
+            values.append(self._current.pop(name, 0.0))
+        # фази, що з'явились уперше
+        for name, ms in self._current.items():
+            values = self.phases[name] = deque([0.0] * (len(self.frames) - 1), maxlen=self.history)
+            values.append(ms)
+        self._current.clear()
+        self.frame_count += 1
+
+    # --- статистика --- #
+
+    @staticmethod
+    def _stats(values) -> dict:
+        ordered = sorted(values)
+        return {
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        }
+
+    def summary(self) -> dict:
+        return {
+            "timestamp": time.time(),
+            "frames": len(self.frames),
+            "frame_count": self.frame_count,
+            "frame_ms": self._stats(self.frames),
+            "phases_ms": {name: self._stats(values) for name, values in sorted(self.phases.items())},
+        }
+
+    # --- оверлей --- #
+
+    def draw_overlay(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        """Графік часу кадру (лінія – бюджет 1000 / FPS) + p95 по фазах."""
+        rect = pygame.Rect(PROFILER_RECT)
+        # панель створюється раз і лише перезаповнюється
+        if self._panel is None or self._panel.get_size() != rect.size:
+            self._panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 170))
+
+        graph_h = 50
+        budget = 1000 / FPS
+        scale = graph_h / (budget * 2)
+        frames = list(self.frames)[-rect.width:]
+        for x, ms in enumerate(frames, rect.width - len(frames)):
+            h = min(graph_h, max(1, int(ms * scale)))
+            color = GREEN if ms <= budget else RED
+            pygame.draw.line(panel, color, (x, graph_h), (x, graph_h - h))
+        pygame.draw.line(panel, WHITE, (0, graph_h - int(budget * scale)), (rect.width, graph_h - int(budget * scale)))
+
+        stats = self._stats(self.frames)
+        lines = [
+            "кадр, мс: p50 / p95 / p99",
+            f"{stats['p50']:.1f} / {stats['p95']:.1f} / {stats['p99']:.1f}",
+        ]
+        for name, values in sorted(self.phases.items()):
+            if name == "wait":
+                continue
+            lines.append(f"{name:<12} p95 {self._stats(values)['p95']:.2f}")
+
+        y = graph_h + 4
+        for line in lines:
+            if y + font.get_linesize() > rect.height:
+                break
+            panel.blit(render_text(font, line, WHITE), (4, y))
+            y += font.get_linesize()
+
+        screen.blit(panel, rect)
+
+
+class MetricsExporter:
+    """
+    Періодичний експорт summary():
+    - шлях до файлу – JSON перезаписується атомарно
+    - udp://host:port – одна JSON-датаграма на експорт
+    """
+
+    def __init__(self, target: str, interval_ms: int = PROFILE_EXPORT_INTERVAL) -> None:
+        self.target = target
+        self.interval_ms = interval_ms
+        self._last = 0
+        self._sock = None
+        self._addr = None
+        if target.startswith("udp://"):
+            host, _, port = target[len("udp://"):].rpartition(":")
+            self._addr = (host or "127.0.0.1", int(port))
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def maybe_export(self, profiler: FrameProfiler, now_ms: int) -> None:
+        if now_ms - self._last < self.interval_ms:
+            return
+        self._last = now_ms
+        self.export(profiler)
+
+    def export(self, profiler: FrameProfiler) -> None:
+        data = json.dumps(profiler.summary(), ensure_ascii=False).encode()
+        try:
+            if self._sock is not None:
+                self._sock.sendto(data, self._addr)
+            else:
+                tmp_path = self.target + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.target)
+        except OSError as e:
+            print(f"⚠ Не вдалось експортувати метрики в {self.target}: {e}")
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
@@ -0,0 +1,65 @@
+"""
+Протокол сервера партій (game.server): кадри фіксованої довжини, little-endian.
+
+Запит, 11 байт:     op u8, request_id u32, session u32, a u8, b u8
+Відповідь, 18 байт: request_id u32, session u32, status u8, bits u64, value u8
+
+bits – позиція сесії після запиту (для HINT – позиція, для якої рахувалась
+підказка). Відповіді на HINT можуть прийти пізніше за наступні запити –
+їх зіставляють за request_id.
+
+    op        a, b              value у відповіді
+    NEW       –                 0; session – номер нової сесії
+    CLICK     рядок, стовпець   1, якщо клік завершив хід
+    MOVE      номер стрибка     1 (нелегальний хід – STATUS_REJECTED)
+    UNDO      –                 1, якщо хід відкочено
+    HINT      –                 номер стрибка або NO_JUMP
+    STATE     –                 кількість легальних ходів (до 255)
+    CLOSE     –                 0
+"""
+
+import struct
+
+REQUEST = struct.Struct("<BIIBB")
+RESPONSE = struct.Struct("<IIBQB")
+
+OP_NEW = 0
+OP_CLICK = 1
+OP_MOVE = 2
+OP_UNDO = 3
+OP_HINT = 4
+OP_STATE = 5
+OP_CLOSE = 6
+
+OP_NAMES = {
+    OP_NEW: "new",
+    OP_CLICK: "click",
+    OP_MOVE: "move",
+    OP_UNDO: "undo",
+    OP_HINT: "hint",
+    OP_STATE: "state",
+    OP_CLOSE: "close",
+}
+
+STATUS_OK = 0
+STATUS_REJECTED = 1
+STATUS_NO_SESSION = 2
+STATUS_BAD_REQUEST = 3
+STATUS_BUSY = 4  # досягнуто SERVER_MAX_SESSIONS
+
+# у value відповіді на HINT: ходів немає
+NO_JUMP = 255
+
+
+def encode_request(op: int, request_id: int, session: int = 0, a: int = 0, b: int = 0) -> bytes:
+    return REQUEST.pack(op, request_id, session, a, b)
+
+
+def encode_response(
+    request_id: int,
+    session: int,
+    status: int = STATUS_OK,
+    bits: int = 0,
+    value: int = 0,
+) -> bytes:
+    return RESPONSE.pack(request_id, session, status, bits, value)
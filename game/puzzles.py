@@ -0,0 +1,293 @@
+"""
+Генератор задач: проміжні позиції з гарантованим розв'язком.
+
+Позиція будується від цілі назад: з однієї фішки робимо випадкові
+зворотні стрибки (фішка в target, порожні source і middle), доки фішок
+не стане скільки треба. Ті самі стрибки у зворотному порядку – розв'язок,
+тож нерозв'язних задач не буває за побудовою; verify() ще раз програє
+розв'язок уперед перед тим, як задача потрапить у видачу.
+
+Складність – кількість фішок і «вузькість» розв'язку: частка перших ходів,
+після яких ціль ще досяжна (рахує BidirectionalSolver; його шари і таблиця
+програшних позицій живуть між задачами одного процесу).
+
+    python -m game.puzzles --count 5000 --difficulty hard --output daily.jsonl
+
+Пакет ділиться на шматки для ProcessPoolExecutor; повтори (з точністю
+до симетрій) відкидаються.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import *
+from game.bidirectional import BidirectionalSolver
+from game.geometries import DEFAULT_GEOMETRY, geometry_names, get_geometry
+from game.position import Geometry
+from game.solver import Symmetries
+
+# назва -> (мінімум фішок, максимум фішок, найбільша частка «правильних» перших ходів)
+DIFFICULTIES = {
+    "easy": (5, 8, 1.0),
+    "medium": (9, 12, 0.75),
+    "hard": (13, 15, 0.5),
+}
+
+# скільки спроб робить generate(), перш ніж визнати складність недосяжною
+MAX_ATTEMPTS = 5_000
+
+# скільки задач генерує воркер за одне завдання пулу
+CHUNK_SIZE = 50
+
+# зворотний фронт розв'язувача глибший, ніж для підказок: будується раз
+# на процес, зате перші ходи складних задач перевіряються пошуком у множині
+LAYER_LIMIT = 100_000
+
+
+class Puzzle:
+    """Позиція + розв'язок (номери стрибків) + оцінка складності."""
+
+    def __init__(
+        self,
+        geometry: Geometry,
+        bits: int,
+        goal: tuple[int, int] | None,
+        solution: list[int],
+        good_moves: int,
+        legal_moves: int,
+        difficulty: str,
+    ) -> None:
+        self.geometry = geometry
+        self.bits = bits
+        self.goal = goal
+        self.solution = solution
+        self.good_moves = good_moves
+        self.legal_moves = legal_moves
+        self.difficulty = difficulty
+
+    @property
+    def pegs(self) -> int:
+        return self.bits.bit_count()
+
+    @property
+    def scarcity(self) -> float:
+        """Частка перших ходів, що ведуть до програшу (0 – будь-який хід добрий)."""
+        return 1 - self.good_moves / self.legal_moves if self.legal_moves else 0.0
+
+    def verify(self) -> bool:
+        """Розв'язок легальний і закінчується в цілі."""
+        bits = self.bits
+        for j in self.solution:
+            if j not in self.geometry.legal_jumps(bits):
+                return False
+            bits = self.geometry.apply_jump(bits, j)
+        if bits & (bits - 1) or not bits:
+            return False
+        return self.goal is None or bits == 1 << self.geometry.index[self.goal]
+
+    def to_dict(self) -> dict:
+        return {
+            "geometry": self.geometry.name,
+            "bits": self.bits,
+            "goal": list(self.goal) if self.goal is not None else None,
+            "solution": self.solution,
+            "pegs": self.pegs,
+            "good_moves": self.good_moves,
+            "legal_moves": self.legal_moves,
+            "difficulty": self.difficulty,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Puzzle":
+        goal = tuple(data["goal"]) if data.get("goal") is not None else None
+        return cls(
+            get_geometry(data["geometry"]),
+            data["bits"],
+            goal,
+            list(data["solution"]),
+            data["good_moves"],
+            data["legal_moves"],
+            data["difficulty"],
+        )
+
+
+class PuzzleGenerator:
+    """
+        generator = PuzzleGenerator(geometry, goal=geometry.center)
+        puzzle = generator.generate("medium")
+    goal=None – остання фішка будь-де (зворотна гра стартує з випадкової клітинки).
+    """
+
+    def __init__(
+        self,
+        geometry: Geometry = DEFAULT_GEOMETRY,
+        goal: tuple[int, int] | None = None,
+        rng: random.Random | None = None,
+        layer_limit: int = LAYER_LIMIT,
+    ) -> None:
+        self.geometry = geometry
+        self.goal = goal
+        self.rng = rng or random.Random()
+        self.solver = BidirectionalSolver(geometry, goal, layer_limit=layer_limit)
+
+    def _reverse_walk(self, pegs: int) -> tuple[int, list[int]] | None:
+        """Випадкова позиція з pegs фішками і розв'язок до неї; None – глухий кут."""
+        g = self.geometry
+        if self.goal is not None:
+            bits = 1 << g.index[self.goal]
+        else:
+            bits = 1 << self.rng.randrange(g.size)
+
+        jumps = []
+        while bits.bit_count() < pegs:
+            back = [
+                j for j, (need, target, flip) in enumerate(g.jump_checks)
+                if bits & target and not bits & need
+            ]
+            if not back:
+                return None
+            j = self.rng.choice(back)
+            bits ^= g.jump_checks[j][2]
+            jumps.append(j)
+        jumps.reverse()
+        return bits, jumps
+
+    def _count_good_moves(self, bits: int, legal: list[int]) -> int:
+        solver = self.solver
+        return sum(
+            1 for j in legal if solver.is_solvable(bits ^ self.geometry.jump_checks[j][2])
+        )
+
+    def generate(self, difficulty: str = "medium", max_attempts: int = MAX_ATTEMPTS) -> Puzzle:
+        """ValueError, якщо за max_attempts спроб задачу такої складності не знайдено."""
+        low, high, max_share = DIFFICULTIES[difficulty]
+        high = min(high, self.geometry.size - 1)
+        if low > high:
+            raise ValueError(f"Складність {difficulty} завелика для дошки {self.geometry.name}")
+        for _ in range(max_attempts):
+            walk = self._reverse_walk(self.rng.randint(low, high))
+            if walk is None:
+                continue
+            bits, solution = walk
+            legal = self.geometry.legal_jumps(bits)
+            good = self._count_good_moves(bits, legal)
+            if good > max_share * len(legal):
+                continue
+            puzzle = Puzzle(self.geometry, bits, self.goal, solution, good, len(legal), difficulty)
+            if puzzle.verify():
+                return puzzle
+        raise ValueError(
+            f"За {max_attempts} спроб не знайдено задачі складності {difficulty}"
+            f" для дошки {self.geometry.name}"
+        )
+
+
+# --- пакетна генерація --- #
+
+# генератор процесу-воркера (створюється першим завданням)
+_generator: PuzzleGenerator | None = None
+
+
+def _generate_chunk(
+    geometry_name: str,
+    goal: tuple[int, int] | None,
+    difficulty: str,
+    count: int,
+    seed: int,
+) -> list[dict]:
+    global _generator
+    geometry = get_geometry(geometry_name)
+    if _generator is None or _generator.geometry is not geometry or _generator.goal != goal:
+        _generator = PuzzleGenerator(geometry, goal)
+    _generator.rng.seed(seed)
+    return [_generator.generate(difficulty).to_dict() for _ in range(count)]
+
+
+def generate_batch(
+    count: int,
+    difficulty: str = "medium",
+    geometry: Geometry = DEFAULT_GEOMETRY,
+    goal: tuple[int, int] | None = None,
+    workers: int | None = None,
+    seed: int | None = None,
+) -> list[Puzzle]:
+    """count різних (з точністю до симетрій) задач, згенерованих на всіх ядрах."""
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    symmetries = Symmetries(geometry, goal)
+    seen: set[int] = set()
+    puzzles: list[Puzzle] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while len(puzzles) < count:
+            # з запасом: частина задач виявиться повторами
+            need = max(count - len(puzzles), CHUNK_SIZE)
+            chunks = [min(CHUNK_SIZE, need - k) for k in range(0, need, CHUNK_SIZE)]
+            futures = [
+                executor.submit(
+                    _generate_chunk, geometry.name, goal, difficulty, n, seeds.getrandbits(64)
+                )
+                for n in chunks
+            ]
+            before = len(puzzles)
+            for future in futures:
+                for data in future.result():
+                    puzzle = Puzzle.from_dict(data)
+                    key = symmetries.canonical(puzzle.bits)
+                    if key in seen or len(puzzles) >= count:
+                        continue
+                    seen.add(key)
+                    puzzles.append(puzzle)
+            if len(puzzles) == before:
+                break  # різних позицій такої складності більше немає
+    return puzzles
+
+
+def load_puzzles(path: str) -> list[Puzzle]:
+    """Задачі з JSONL-файлу (по одній на рядок)."""
+    with open(path, encoding="utf-8") as f:
+        return [Puzzle.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def save_puzzles(path: str, puzzles: list[Puzzle]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for puzzle in puzzles:
+            f.write(json.dumps(puzzle.to_dict()) + "\n")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Генерація задач з гарантованим розв'язком")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--difficulty", choices=list(DIFFICULTIES), default="medium")
+    parser.add_argument("--geometry", choices=geometry_names(), default=BOARD_GEOMETRY)
+    parser.add_argument(
+        "--center",
+        action="store_true",
+        help="остання фішка має стояти в центрі",
+    )
+    parser.add_argument("--workers", type=int, help="процесів (за замовчуванням – усі ядра)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", default=PUZZLES_PATH)
+    args = parser.parse_args(argv)
+
+    geometry = get_geometry(args.geometry)
+    goal = geometry.center if args.center else None
+    started = time.time()
+    try:
+        puzzles = generate_batch(args.count, args.difficulty, geometry, goal, args.workers, args.seed)
+    except ValueError as e:
+        sys.exit(str(e))
+    save_puzzles(args.output, puzzles)
+
+    elapsed = time.time() - started
+    rate = len(puzzles) / elapsed * 60 if elapsed else 0
+    print(f"✓ {args.output}: {len(puzzles):,} задач за {elapsed:.1f} с ({rate:,.0f} за хвилину)")
+
+
+if __name__ == "__main__":
+    main()
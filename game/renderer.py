@@ -0,0 +1,80 @@
+from contextlib import nullcontext
+
+import pygame
+
+
+class Renderer:
+    """
+    Retained-mode малювання кадру.
+
+    - статичний шар (фон, дошка, порожні отвори) малюється один раз
+    - кожна область екрана має свій «стан»; якщо він не змінився з
+      минулого кадру, область не перемальовується
+    - на екран виводяться лише змінені прямокутники (display.update)
+    """
+
+    def __init__(self, screen: pygame.Surface, draw_static, draw_dynamic, profiler=None) -> None:
+        self.screen = screen
+        # draw_static(surface) – те, що не змінюється під час гри
+        # draw_dynamic(surface) – усе інше; малюється з обрізанням по clip
+        self._draw_static = draw_static
+        self._draw_dynamic = draw_dynamic
+        # FrameProfiler: фази draw.static і draw.flip
+        self._phase = profiler.phase if profiler is not None else (lambda name: nullcontext())
+
+        self.static_layer: pygame.Surface | None = None
+        self._states: dict = {}
+        self._full_redraw = True
+
+    def invalidate(self, static: bool = False) -> None:
+        """Наступний кадр перемалювати повністю (static – і статичний шар теж)."""
+        self._full_redraw = True
+        if static:
+            self.static_layer = None
+
+    def _build_static_layer(self) -> None:
+        self.static_layer = pygame.Surface(self.screen.get_size()).convert()
+        self._draw_static(self.static_layer)
+
+    def render(self, regions: dict) -> list[pygame.Rect]:
+        """
+        regions: ключ -> (Rect, стан). Повертає прямокутники,
+        які реально потрапили на екран (порожній список – кадр пропущено).
+        """
+        if self.static_layer is None:
+            with self._phase("draw.static"):
+                self._build_static_layer()
+            self._full_redraw = True
+
+        if self._full_redraw:
+            dirty = [self.screen.get_rect()]
+        else:
+            dirty = []
+            for key, (rect, state) in regions.items():
+                old = self._states.get(key)
+                if old is None or old[1] != state:
+                    dirty.append(rect)
+                    if old is not None and old[0] != rect:
+                        dirty.append(old[0])
+            # області, які зникли з кадру
+            for key, (rect, _) in self._states.items():
+                if key not in regions:
+                    dirty.append(rect)
+
+        self._states = dict(regions)
+        if not dirty:
+            return []
+
+        clip = dirty[0].unionall(dirty[1:]) if len(dirty) > 1 else dirty[0]
+        self.screen.set_clip(clip)
+        self.screen.blit(self.static_layer, clip, clip)
+        self._draw_dynamic(self.screen)
+        self.screen.set_clip(None)
+
+        with self._phase("draw.flip"):
+            if self._full_redraw:
+                self._full_redraw = False
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+        return dirty
@@ -0,0 +1,301 @@
+"""
+Безголовий сервер партій: тисячі незалежних Board в одному процесі.
+
+    python -m game.server --port 7777
+    python -m game.server --unix /tmp/peg.sock
+
+Клієнт відкриває з'єднання (TCP або Unix-сокет) і обмінюється кадрами
+game.protocol. Сесія належить з'єднанню, яке її створило, і
+звільняється разом з ним. Запити можна слати один за одним, не чекаючи
+відповідей.
+
+Підказки не рахуються одразу: запити складаються в чергу, і щонайбільше
+раз на SERVER_HINT_BATCH_MS мс (або при SERVER_HINT_BATCH_SIZE позиціях)
+вся черга обробляється одним пакетом у робочому потоці. Однакові позиції
+рахуються раз, а всі дочірні позиції пакета оцінюються одним викликом
+Evaluator.
+"""
+
+import argparse
+import asyncio
+import os
+
+# до імпорту pygame (через game.board): сервер без вікна і звуку
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from config import *
+from game.board import Board, get_win_database
+from game.geometries import DEFAULT_GEOMETRY
+from game.policies import center_distance_moves, get_evaluator
+from game.position import Geometry
+from game.protocol import (
+    NO_JUMP,
+    OP_CLICK,
+    OP_CLOSE,
+    OP_HINT,
+    OP_MOVE,
+    OP_NEW,
+    OP_STATE,
+    OP_UNDO,
+    REQUEST,
+    STATUS_BAD_REQUEST,
+    STATUS_BUSY,
+    STATUS_NO_SESSION,
+    STATUS_OK,
+    STATUS_REJECTED,
+    encode_response,
+)
+
+# скільки байт відповідей може накопичитись у сокеті, перш ніж чекати drain()
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+
+def batch_hint_jumps(geometry: Geometry, positions: list[int]) -> list[int | None]:
+    """
+    Підказка для кожної позиції (None – ходів немає): ходи, що лишають
+    позицію виграшною (якщо є таблиця), з найкращою оцінкою Evaluator.
+    """
+    checks = geometry.jump_checks
+    db = get_win_database() if geometry is DEFAULT_GEOMETRY else None
+    evaluator = get_evaluator(geometry)
+
+    candidates: list[list[int]] = []
+    for bits in positions:
+        jumps = geometry.legal_jumps(bits)
+        if db is not None:
+            winning = [j for j in jumps if db.is_winnable(bits ^ checks[j][2])]
+            if winning:
+                jumps = winning
+        candidates.append(jumps)
+
+    if evaluator is None:
+        return [center_distance_moves(geometry, jumps)[0] if jumps else None for jumps in candidates]
+
+    children = [bits ^ checks[j][2] for bits, jumps in zip(positions, candidates) for j in jumps]
+    scores = evaluator.score_bits(children) if children else []
+    result: list[int | None] = []
+    k = 0
+    for jumps in candidates:
+        best = None
+        best_score = 0.0
+        for j in jumps:
+            if best is None or scores[k] > best_score:
+                best, best_score = j, scores[k]
+            k += 1
+        result.append(best)
+    return result
+
+
+class GameServer:
+    """
+        server = GameServer()
+        await server.start(port=7777)      # або path="/tmp/peg.sock"
+        await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        geometry: Geometry = DEFAULT_GEOMETRY,
+        hint_batch_ms: float = SERVER_HINT_BATCH_MS,
+        hint_batch_size: int = SERVER_HINT_BATCH_SIZE,
+        max_sessions: int = SERVER_MAX_SESSIONS,
+    ) -> None:
+        if geometry.size > 64:
+            raise ValueError("Дошка завелика для 64-бітної позиції в протоколі")
+
+        self.geometry = geometry
+        self.hint_batch_ms = hint_batch_ms
+        self.hint_batch_size = hint_batch_size
+        self.max_sessions = max_sessions
+
+        self.session_count = 0
+        self._next_session = 1
+        self._server: asyncio.AbstractServer | None = None
+
+        # черга підказок: (позиція, future з номером стрибка)
+        self._hint_queue: list[tuple[int, asyncio.Future]] = []
+        self._hint_wakeup = asyncio.Event()
+        self._batcher: asyncio.Task | None = None
+
+        # лічильники для журналу
+        self.requests = 0
+        self.hint_batches = 0
+        self.hint_positions = 0
+
+    # --- життєвий цикл --- #
+
+    async def start(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        path: str | None = None,
+    ) -> None:
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._batcher = asyncio.create_task(self._hint_batcher())
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+
+    @property
+    def addresses(self) -> list:
+        return [sock.getsockname() for sock in self._server.sockets]
+
+    # --- з'єднання --- #
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # сесії цього з'єднання: номер -> дошка
+        sessions: dict[int, Board] = {}
+        hints: set[asyncio.Task] = set()
+        try:
+            while True:
+                op, request_id, session_id, a, b = REQUEST.unpack(
+                    await reader.readexactly(REQUEST.size)
+                )
+                self.requests += 1
+
+                if op == OP_HINT and session_id in sessions:
+                    task = asyncio.create_task(
+                        self._reply_hint(writer, request_id, session_id, sessions[session_id])
+                    )
+                    hints.add(task)
+                    task.add_done_callback(hints.discard)
+                else:
+                    writer.write(self._handle(sessions, op, request_id, session_id, a, b))
+
+                if writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in hints:
+                task.cancel()
+            self.session_count -= len(sessions)
+            sessions.clear()
+            writer.close()
+
+    def _handle(
+        self,
+        sessions: dict[int, Board],
+        op: int,
+        request_id: int,
+        session_id: int,
+        a: int,
+        b: int,
+    ) -> bytes:
+        if op == OP_NEW:
+            if self.session_count >= self.max_sessions:
+                return encode_response(request_id, 0, STATUS_BUSY)
+            session_id = self._next_session
+            self._next_session += 1
+            board = sessions[session_id] = Board(self.geometry)
+            self.session_count += 1
+            return encode_response(request_id, session_id, STATUS_OK, board.position.bits)
+
+        board = sessions.get(session_id)
+        if board is None:
+            return encode_response(request_id, session_id, STATUS_NO_SESSION)
+
+        value = 0
+        status = STATUS_OK
+        if op == OP_CLICK:
+            value = int(board.click_cell(a, b))
+        elif op == OP_MOVE:
+            if board.play_jump(a):
+                value = 1
+            else:
+                status = STATUS_REJECTED
+        elif op == OP_UNDO:
+            value = int(board.undo_move())
+        elif op == OP_STATE:
+            value = min(255, board.get_legal_move_count())
+        elif op == OP_CLOSE:
+            del sessions[session_id]
+            self.session_count -= 1
+        else:
+            return encode_response(request_id, session_id, STATUS_BAD_REQUEST)
+        return encode_response(request_id, session_id, status, board.position.bits, value)
+
+    async def _reply_hint(
+        self,
+        writer: asyncio.StreamWriter,
+        request_id: int,
+        session_id: int,
+        board: Board,
+    ) -> None:
+        bits = board.position.bits
+        j = await self.hint(bits)
+        if not writer.is_closing():
+            value = NO_JUMP if j is None else j
+            writer.write(encode_response(request_id, session_id, STATUS_OK, bits, value))
+
+    # --- пакетні підказки --- #
+
+    def hint(self, bits: int) -> asyncio.Future:
+        """Future з підказкою для позиції; рахується в найближчому пакеті."""
+        future = asyncio.get_running_loop().create_future()
+        self._hint_queue.append((bits, future))
+        self._hint_wakeup.set()
+        return future
+
+    async def _hint_batcher(self) -> None:
+        while True:
+            await self._hint_wakeup.wait()
+            if len(self._hint_queue) < self.hint_batch_size:
+                await asyncio.sleep(self.hint_batch_ms / 1000)
+            self._hint_wakeup.clear()
+
+            batch, self._hint_queue = self._hint_queue, []
+            waiting: dict[int, list[asyncio.Future]] = {}
+            for bits, future in batch:
+                waiting.setdefault(bits, []).append(future)
+            positions = list(waiting)
+
+            try:
+                jumps = await asyncio.to_thread(batch_hint_jumps, self.geometry, positions)
+            except Exception as e:
+                # клієнти не мають чекати вічно: відповідаємо «ходу немає»
+                print(f"⚠ Пакет підказок не пораховано: {e}")
+                jumps = [None] * len(positions)
+            self.hint_batches += 1
+            self.hint_positions += len(positions)
+            for bits, j in zip(positions, jumps):
+                for future in waiting[bits]:
+                    if not future.done():
+                        future.set_result(j)
+
+
+async def _serve(args) -> None:
+    server = GameServer()
+    await server.start(args.host, args.port, args.unix)
+    print(f"Сервер партій слухає {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Сервер партій без вікна")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Unix-сокет замість TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Збереження і відновлення ігрової сесії.
+
+Знімок – кілька десятків байт (little-endian):
+- magic b"PEGS", версія (1 байт)
+- вибрана фішка: індекс клітинки + 1 (1 байт, 0 – немає)
+- підказка: номер стрибка + 1 (1 байт, 0 – немає)
+- історія: довжина (uint16) + MoveHistory.to_bytes()
+- redo-хвіст: довжина (uint16) + номери стрибків
+
+Позиція дошки відновлюється з історії, тож окремо не зберігається.
+Запис на диск робить фоновий потік (Autosaver), тому кадр не чекає на диск.
+"""
+
+import os
+import struct
+import threading
+
+from game.board import Board
+from game.history import MoveHistory
+
+MAGIC = b"PEGS"
+VERSION = 1
+
+
+def encode_session(board: Board) -> bytes:
+    history = board.move_history
+    selected = 0
+    if board.selected_peg is not None:
+        peg = board.selected_peg
+        selected = board.geometry.index[(peg.row, peg.col)] + 1
+    hint = board.hint_move["jump"] + 1 if board.hint_move is not None else 0
+
+    history_bytes = history.to_bytes()
+    redo_tail = bytes(history.moves[history.cursor:])
+    return b"".join(
+        (
+            MAGIC,
+            struct.pack("<BBB", VERSION, selected, hint),
+            struct.pack("<H", len(history_bytes)),
+            history_bytes,
+            struct.pack("<H", len(redo_tail)),
+            redo_tail,
+        )
+    )
+
+
+def decode_session(data: bytes) -> Board:
+    if data[:4] != MAGIC:
+        raise ValueError("Не файл сесії")
+    version, selected, hint = struct.unpack_from("<BBB", data, 4)
+    if version != VERSION:
+        raise ValueError(f"Непідтримувана версія сесії: {version}")
+
+    offset = 7
+    (history_len,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    history = MoveHistory.from_bytes(data[offset:offset + history_len])
+    offset += history_len
+    (tail_len,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    tail = data[offset:offset + tail_len]
+    if len(tail) != tail_len:
+        raise ValueError("Файл сесії обрізаний")
+
+    # redo-хвіст дописуємо без зсуву курсора; контрольні точки мають
+    # покривати й хвіст, інакше push() допише їх не на ті індекси
+    history.moves.extend(tail)
+    _check_moves(history)
+    history._rebuild_checkpoints()
+
+    board = Board(history.geometry)
+    board.load_history(history)
+
+    if selected:
+        r, c = board.geometry.cells[selected - 1]
+        peg = board.get_peg_at(r, c)
+        if peg is not None:
+            board._handle_peg_click(peg)
+    elif hint and hint - 1 in board.position.moves:
+        board.hint_move = board._move_from_jump(hint - 1)
+        sr, sc = board.hint_move["source"]
+        board.hint_source = board.cells[sr][sc]
+    return board
+
+
+def _check_moves(history: MoveHistory) -> None:
+    """ValueError, якщо зіграні ходи чи redo-хвіст не відтворюються від старту."""
+    checks = history.geometry.jump_checks
+    bits = history.start_bits
+    for i, j in enumerate(history.moves):
+        if j >= len(checks):
+            raise ValueError(f"Невідомий стрибок {j}")
+        need, target, flip = checks[j]
+        if bits & need != need or bits & target:
+            raise ValueError(f"Нелегальний хід {i + 1} у сесії")
+        bits ^= flip
+
+
+def load_session(path: str) -> Board | None:
+    """Board зі збереженої сесії або None, якщо файлу немає чи він зіпсований."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"⚠ Не вдалось прочитати сесію {path}: {e}")
+        return None
+
+    try:
+        return decode_session(data)
+    except (ValueError, KeyError, IndexError, struct.error) as e:
+        print(f"⚠ Сесію {path} не відновлено: {e}")
+        return None
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Запис через тимчасовий файл + fsync + rename: після збою живлення лишається старий або новий файл."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Autosaver:
+    """
+    Фоновий запис знімків. Зберігається лише найсвіжіший знімок:
+    якщо диск повільний, проміжні просто пропускаються.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._pending: bytes | None = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes) -> None:
+        with self._cond:
+            self._pending = data
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+            try:
+                write_atomic(self.path, data)
+            except OSError as e:
+                print(f"⚠ Не вдалось зберегти сесію {self.path}: {e}")
+
+    def close(self) -> None:
+        """Дописати останній знімок і зупинити потік."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
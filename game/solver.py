@@ -0,0 +1,153 @@
+from game.geometries import DEFAULT_GEOMETRY
+from game.pagoda import get_pagoda_set
+from game.position import Geometry
+
+
+# 8 симетрій квадрата: (r, c) -> нова клітинка, n – розмір сторони
+_TRANSFORMS = (
+    lambda r, c, n: (r, c),
+    lambda r, c, n: (c, n - 1 - r),
+    lambda r, c, n: (n - 1 - r, n - 1 - c),
+    lambda r, c, n: (n - 1 - c, r),
+    lambda r, c, n: (r, n - 1 - c),
+    lambda r, c, n: (n - 1 - r, c),
+    lambda r, c, n: (c, r),
+    lambda r, c, n: (n - 1 - c, n - 1 - r),
+)
+
+
+class Symmetries:
+    """
+    Симетрії геометрії, що зберігають маску (і клітинку-ціль, якщо задана).
+    Перетворення бітової маски робиться через таблиці по 8 біт,
+    тому одна симетрія коштує кілька звертань до списків, а не цикл по 33 бітах.
+    """
+
+    def __init__(self, geometry: Geometry, goal: tuple[int, int] | None = None) -> None:
+        self.geometry = geometry
+        self.perms: list[list[int]] = []
+
+        n = max(geometry.rows, geometry.cols)
+        for transform in _TRANSFORMS:
+            perm = []
+            for r, c in geometry.cells:
+                i = geometry.index.get(transform(r, c, n))
+                if i is None:
+                    break
+                perm.append(i)
+            else:
+                if goal is not None and transform(*goal, n) != goal:
+                    continue
+                if perm not in self.perms and self._keeps_jumps(perm):
+                    self.perms.append(perm)
+
+        self._chunks = (geometry.size + 7) // 8
+        self._tables = [self._build_tables(perm) for perm in self.perms[1:]]
+
+    def _keeps_jumps(self, perm: list[int]) -> bool:
+        """Симетрія маски має ще й переводити стрибки в стрибки (для трикутної дошки – не всі)."""
+        g = self.geometry
+        for si, mi, ti in g.jump_cells:
+            j = g.jump_by_ends.get((perm[si], perm[ti]))
+            if j is None or g.jump_cells[j][1] != perm[mi]:
+                return False
+        return True
+
+    def _build_tables(self, perm: list[int]) -> list[list[int]]:
+        tables = []
+        for chunk in range(self._chunks):
+            table = [0] * 256
+            for value in range(256):
+                out = 0
+                for bit in range(8):
+                    i = chunk * 8 + bit
+                    if value >> bit & 1 and i < len(perm):
+                        out |= 1 << perm[i]
+                table[value] = out
+            tables.append(table)
+        return tables
+
+    def transform(self, bits: int, k: int) -> int:
+        """Застосувати k-ту симетрію (0 – тотожна)."""
+        if k == 0:
+            return bits
+        out = 0
+        for table in self._tables[k - 1]:
+            out |= table[bits & 0xFF]
+            bits >>= 8
+        return out
+
+    def canonical(self, bits: int) -> int:
+        """Найменше з усіх симетричних зображень позиції."""
+        best = bits
+        for tables in self._tables:
+            b = bits
+            out = 0
+            for table in tables:
+                out |= table[b & 0xFF]
+                b >>= 8
+            if out < best:
+                best = out
+        return best
+
+
+class Solver:
+    """
+    Повний перебір у глибину з таблицею програшних позицій.
+    Програшні позиції запам'ятовуються в канонічній формі,
+    тож кожен клас симетричних позицій розбирається лише раз.
+
+    goal=None – достатньо залишити одну фішку будь-де,
+    goal=(r, c) – остання фішка має стояти в цій клітинці.
+
+    Для конкретної цілі гілки, програш яких доводить пагода-функція,
+    відсікаються без перебору (prune=False – вимкнути). Для goal=None
+    пагоди майже нічого не відсікають, тож там вони не вмикаються.
+    """
+
+    def __init__(
+        self,
+        geometry: Geometry = DEFAULT_GEOMETRY,
+        goal: tuple[int, int] | None = None,
+        prune: bool = True,
+    ) -> None:
+        self.geometry = geometry
+        self.goal = goal
+        self.goal_bits = 1 << geometry.index[goal] if goal is not None else None
+        self.symmetries = Symmetries(geometry, goal)
+        self.pagodas = get_pagoda_set(geometry, goal) if prune and goal is not None else None
+        self.dead: set[int] = set()
+        self.nodes = 0
+
+    def solve(self, bits: int) -> list[int] | None:
+        """Послідовність номерів стрибків до цілі або None, якщо її немає."""
+        path: list[int] = []
+        if self._search(bits, path):
+            return path
+        return None
+
+    def is_solvable(self, bits: int) -> bool:
+        return self.solve(bits) is not None
+
+    def _search(self, bits: int, path: list[int]) -> bool:
+        self.nodes += 1
+
+        if bits & (bits - 1) == 0:
+            return self.goal_bits is None or bits == self.goal_bits
+
+        if self.pagodas is not None and self.pagodas.is_lost(bits):
+            return False
+
+        key = self.symmetries.canonical(bits)
+        if key in self.dead:
+            return False
+
+        for j, (need, target, flip) in enumerate(self.geometry.jump_checks):
+            if bits & need == need and not bits & target:
+                path.append(j)
+                if self._search(bits ^ flip, path):
+                    return True
+                path.pop()
+
+        self.dead.add(key)
+        return False
@@ -0,0 +1,63 @@
+"""
+Кеш відрендереного тексту.
+
+font.render щоразу растеризує рядок і створює нову Surface, а HUD,
+кнопки й оверлеї перемальовують ті самі рядки в кожному кадрі, де щось
+змінилось. Тут рядки кешуються за (шрифт, текст, колір) з витісненням
+найдавніше використаних, а шрифти – за (файл, розмір).
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from config import *
+
+
+class TextCache:
+    """LRU: (шрифт, текст, колір) -> Surface."""
+
+    def __init__(self, max_entries: int = TEXT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self._surfaces[key] = font.render(text, True, color)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+
+# один кеш на процес: HUD, кнопки й оверлеї часто малюють ті самі рядки
+_text_cache = TextCache()
+
+# (файл шрифту, розмір) -> Font
+_fonts: dict[tuple[str | None, int], pygame.font.Font] = {}
+
+
+def render_text(font: pygame.font.Font, text: str, color) -> pygame.Surface:
+    """Згладжений текст зі спільного кешу. Surface не можна змінювати."""
+    return _text_cache.render(font, text, color)
+
+
+def get_font(name: str | None, size: int) -> pygame.font.Font:
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
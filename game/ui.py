@@ -1,5 +1,7 @@
 import pygame
 from config import *
+from game.assets import AssetCache
+from game.text_cache import get_font, render_text
 
 
 class Button:
@@ -14,16 +16,16 @@ class Button:
             "pressed": f"button_{button_type}_pressed",
         }
 
-    def draw(self, screen: pygame.Surface, images: dict) -> None:
+    def draw(self, screen: pygame.Surface, assets: AssetCache) -> None:
         if not self.visible:
             return
 
         key = self.image_keys.get(self.state, self.image_keys["normal"])
-        image = images.get(key)
+        sprite = assets.sprite(key, self.rect.size) if key in assets else None
 
-        if image is not None and image.get_width() > 0:
-            img = pygame.transform.smoothscale(image, (self.rect.width, self.rect.height))
-            screen.blit(img, self.rect)
+        if sprite is not None:
+            img, area = sprite
+            screen.blit(img, self.rect, area)
         else:
             self._draw_fallback(screen)
 
@@ -35,9 +37,8 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=18)
         pygame.draw.rect(screen, (120, 100, 80), self.rect, 2, border_radius=18)
 
-        font = pygame.font.Font(None, 26)
         text = self.button_type.capitalize()
-        surf = font.render(text, True, (90, 70, 50))
+        surf = render_text(get_font(None, 26), text, (90, 70, 50))
         rect = surf.get_rect(center=self.rect.center)
         screen.blit(surf, rect)
 
@@ -76,9 +77,9 @@ class UI:
             x, y = pos
             self.buttons[key] = Button(x, y, BUTTON_WIDTH, BUTTON_HEIGHT, key)
 
-    def draw(self, screen: pygame.Surface, images: dict) -> None:
+    def draw(self, screen: pygame.Surface, assets: AssetCache) -> None:
         for button in self.buttons.values():
-            button.draw(screen, images)
+            button.draw(screen, assets)
 
     def handle_events(self, event):
         for button in self.buttons.values():
@@ -0,0 +1,221 @@
+"""
+Таблиця виграшних позицій.
+
+Офлайн-крок (python -m game.windb) перебирає всі позиції, досяжні зі старту,
+і записує канонічні форми тих, з яких ще можна залишити одну фішку.
+Файл читається через mmap: кілька процесів гри на одній машині ділять
+ті самі сторінки кешу ОС замість того, щоб кожен вантажив таблицю в пам'ять.
+
+Формат файлу (little-endian):
+- заголовок: magic, версія, кількість клітинок, відбиток геометрії,
+  клітинка-ціль (+1, 0 – будь-де), біти індексу, кількість ключів
+- індекс: 2**index_bits + 1 зсувів uint32 за старшими бітами ключа
+- ключі: відсортовані uint64
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_left
+
+from config import *
+from game.geometries import DEFAULT_GEOMETRY, geometry_names, get_geometry
+from game.position import Geometry
+from game.solver import Symmetries
+
+MAGIC = b"PEGWINDB"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIIII")
+MAX_INDEX_BITS = 16
+
+
+def geometry_fingerprint(geometry: Geometry) -> int:
+    return zlib.crc32(repr(geometry.cells).encode())
+
+
+def enumerate_winnable(
+    geometry: Geometry,
+    goal: tuple[int, int] | None = None,
+    start_bits: int | None = None,
+    progress=None,
+) -> set[int]:
+    """
+    Усі досяжні зі старту позиції, з яких ціль ще досяжна (канонічні ключі).
+    Перебір повний: на відміну від Solver, пошук не зупиняється на першому розв'язку.
+    """
+    symmetries = Symmetries(geometry, goal)
+    canonical = symmetries.canonical
+    checks = geometry.jump_checks
+    goal_bits = 1 << geometry.index[goal] if goal is not None else None
+
+    alive: set[int] = set()
+    dead: set[int] = set()
+
+    def visit(bits: int) -> bool:
+        if bits & (bits - 1) == 0:
+            won = goal_bits is None or bits == goal_bits
+            (alive if won else dead).add(canonical(bits))
+            return won
+
+        key = canonical(bits)
+        if key in alive:
+            return True
+        if key in dead:
+            return False
+
+        won = False
+        for need, target, flip in checks:
+            if bits & need == need and not bits & target:
+                if visit(bits ^ flip):
+                    won = True
+
+        (alive if won else dead).add(key)
+        if progress is not None and (len(alive) + len(dead)) % 100_000 == 0:
+            progress(len(alive), len(dead))
+        return won
+
+    if start_bits is None:
+        start_bits = geometry.start_bits()
+    visit(start_bits)
+    return alive
+
+
+def build(
+    path: str,
+    geometry: Geometry = DEFAULT_GEOMETRY,
+    goal: tuple[int, int] | None = None,
+    progress=None,
+) -> int:
+    """Побудувати файл таблиці. Повертає кількість виграшних ключів."""
+    keys = sorted(enumerate_winnable(geometry, goal, progress=progress))
+
+    index_bits = min(MAX_INDEX_BITS, geometry.size)
+    shift = geometry.size - index_bits
+    buckets = 1 << index_bits
+
+    index = [0] * (buckets + 1)
+    for key in keys:
+        index[(key >> shift) + 1] += 1
+    for b in range(buckets):
+        index[b + 1] += index[b]
+
+    goal_code = geometry.index[goal] + 1 if goal is not None else 0
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        geometry.size,
+        geometry_fingerprint(geometry),
+        goal_code,
+        index_bits,
+        len(keys),
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(struct.pack(f"<{len(index)}I", *index))
+        # ключі вирівнюємо на 8 байт, щоб читати їх через memoryview.cast("Q")
+        f.write(b"\0" * (-f.tell() % 8))
+        for start in range(0, len(keys), 65536):
+            chunk = keys[start:start + 65536]
+            f.write(struct.pack(f"<{len(chunk)}Q", *chunk))
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+class WinDatabase:
+    """Перевірка «чи ще виграшна позиція» за один пошук у відображеному файлі."""
+
+    def __init__(self, path: str, geometry: Geometry = DEFAULT_GEOMETRY) -> None:
+        self.path = path
+        self.geometry = geometry
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, size, fingerprint, goal_code, index_bits, count = (
+            HEADER.unpack_from(self._mmap, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: не файл таблиці виграшних позицій")
+        if size != geometry.size or fingerprint != geometry_fingerprint(geometry):
+            self.close()
+            raise ValueError(f"{path}: таблиця побудована для іншої дошки")
+
+        self.goal = geometry.cells[goal_code - 1] if goal_code else None
+        self.count = count
+        self._shift = size - index_bits
+        self.symmetries = Symmetries(geometry, self.goal)
+
+        view = memoryview(self._mmap)
+        index_start = HEADER.size
+        index_end = index_start + ((1 << index_bits) + 1) * 4
+        keys_start = index_end + (-index_end % 8)
+        self._index = view[index_start:index_end].cast("I")
+        self._keys = view[keys_start:keys_start + count * 8].cast("Q")
+
+    @classmethod
+    def open_default(cls, geometry: Geometry = DEFAULT_GEOMETRY) -> "WinDatabase | None":
+        """Таблиця з WIN_DB_PATH, або None, якщо її ще не побудували."""
+        if not os.path.exists(WIN_DB_PATH):
+            return None
+        try:
+            return cls(WIN_DB_PATH, geometry)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Не вдалось відкрити таблицю {WIN_DB_PATH}: {e}")
+            return None
+
+    def is_winnable(self, bits: int) -> bool:
+        """
+        True, якщо з позиції ще можна дійти до цілі.
+        Позиції, недосяжні зі стартової, у таблиці відсутні й дають False.
+        """
+        key = self.symmetries.canonical(bits)
+        bucket = key >> self._shift
+        lo = self._index[bucket]
+        hi = self._index[bucket + 1]
+        i = bisect_left(self._keys, key, lo, hi)
+        return i < hi and self._keys[i] == key
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for name in ("_index", "_keys"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Побудова таблиці виграшних позицій")
+    parser.add_argument("--output", default=WIN_DB_PATH)
+    parser.add_argument("--geometry", choices=geometry_names(), default=BOARD_GEOMETRY)
+    parser.add_argument(
+        "--center",
+        action="store_true",
+        help="виграш – лише остання фішка в центрі",
+    )
+    args = parser.parse_args(argv)
+
+    geometry = get_geometry(args.geometry)
+    goal = geometry.center if args.center else None
+    started = time.time()
+
+    def progress(alive: int, dead: int) -> None:
+        print(f"  позицій: {alive + dead:,} (виграшних {alive:,}), {time.time() - started:.0f} с")
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), geometry.size * 4))
+    count = build(args.output, geometry, goal, progress)
+    print(f"✓ {args.output}: {count:,} виграшних позицій за {time.time() - started:.0f} с")
+
+
+if __name__ == "__main__":
+    main()
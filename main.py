@@ -1,13 +1,39 @@
+import argparse
+import datetime
 import sys
 import pygame
 
 from config import *
+from game.assets import AssetCache
 from game.board import Board
+from game.hint_service import HINT_READY_EVENT, HintService
+from game.profiler import FrameProfiler, MetricsExporter
+from game.puzzles import Puzzle, load_puzzles
+from game.renderer import Renderer
+from game.session import Autosaver, encode_session, load_session
+from game.text_cache import render_text
 from game.ui import UI
 
+# подія таймера автопідказки
+AUTO_HINT_EVENT = pygame.event.custom_type()
+
+# події, після яких цикл деякий час працює на повному FPS
+INPUT_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+)
+
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        load_assets: bool = True,
+        session_path: str | None = SESSION_PATH,
+        profile_export: str | None = None,
+        puzzle: Puzzle | None = None,
+    ) -> None:
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Peg Solitaire")
@@ -16,49 +42,136 @@ class Game:
         self.running = True
         self.state = STATE_PLAYING
 
-        self.images: dict[str, pygame.Surface] = {}
-        self._load_assets()
-
-        self.board = Board()
+        # текстури вантажаться ліниво, при першому малюванні
+        self.assets = AssetCache(IMAGE_PATHS, enabled=load_assets)
+
+        # відновлюємо попередню сесію (кіоски часто перезавантажують)
+        # session_path=None – чиста партія без автозбереження (бенчмарки тощо)
+        # задача (--puzzles) важливіша за збережену сесію
+        self.puzzle = puzzle
+        restored = load_session(session_path) if session_path and puzzle is None else None
+        self.board = restored or self._new_board()
+        self.autosaver = Autosaver(session_path) if session_path else None
+        # підказки рахуються в окремому процесі; поки чекаємо – «думаю»
+        self.hint_service = HintService(self.board.geometry)
+        self.hint_pending = False
+        self.font_warning = pygame.font.Font(None, 26)
         self.ui = UI()
 
         self.font_main = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 24)
+        # оверлей кінця гри: затемнення створюється раз, написи – коли зміниться ключ
+        self._overlay_dim: pygame.Surface | None = None
+        self._overlay_key = None
+        self._overlay_texts: list[tuple[pygame.Surface, pygame.Rect]] = []
+
+        # час по фазах кадру; F3 – оверлей, --profile-export – перцентилі у файл/сокет
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.font_profiler = pygame.font.Font(None, 18)
+        self.metrics_exporter = MetricsExporter(profile_export) if profile_export else None
 
-    # --- ресурси --- #
-
-    def _load_assets(self) -> None:
-        for key, path in IMAGE_PATHS.items():
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                self.images[key] = img
-                print(f"✓ Завантажено: {key} -> {path}")
-            except Exception as e:
-                print(f"⚠ Не вдалось завантажити {path}: {e}")
-                # прозора заглушка
-                surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-                surf.fill((0, 0, 0, 0))
-                self.images[key] = surf
+        self.renderer = Renderer(self.screen, self._draw_static, self._draw_dynamic, self.profiler)
+
+        self.last_input_time = -ACTIVE_LINGER
+        self._schedule_auto_hint()
+        self._check_game_over()
 
     # --- цикл --- #
 
     def run(self) -> None:
+        profiler = self.profiler
         while self.running:
-            self._handle_events()
-            self._update()
-            self._draw()
-            self.clock.tick(FPS)
-
+            with profiler.phase("wait"):
+                events = self._next_events()
+
+            profiler.begin_frame()
+            with profiler.phase("events"):
+                self._handle_events(events)
+            with profiler.phase("update"):
+                self._update()
+            with profiler.phase("draw"):
+                self._draw()
+            profiler.end_frame()
+
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.maybe_export(profiler, pygame.time.get_ticks())
+
+            if self._is_active():
+                with profiler.phase("wait"):
+                    self.clock.tick(FPS)
+
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.export(profiler)
+            self.metrics_exporter.close()
+        self.hint_service.close()
+        if self.autosaver is not None:
+            self.autosaver.close()
         pygame.quit()
         sys.exit()
 
+    def _is_active(self) -> bool:
+        """Повний FPS – лише поки триває ввід (натиснута кнопка миші тощо)."""
+        if any(pygame.mouse.get_pressed()):
+            return True
+        return pygame.time.get_ticks() - self.last_input_time < ACTIVE_LINGER
+
+    def _next_events(self) -> list:
+        if self._is_active():
+            return pygame.event.get()
+
+        # простій: спимо до першої події (або IDLE_WAIT мс)
+        first = pygame.event.wait(IDLE_WAIT)
+        return [first] + pygame.event.get()
+
+    def _schedule_auto_hint(self) -> None:
+        """(Пере)запустити відлік HINT_DELAY до автопідказки."""
+        pygame.time.set_timer(AUTO_HINT_EVENT, HINT_DELAY, loops=1)
+
+    # --- підказки --- #
+
+    def _request_hint(self) -> None:
+        if self.hint_service.geometry is not self.board.geometry:
+            self.hint_service.close()
+            self.hint_service = HintService(self.board.geometry)
+        self.board.show_hint(None)
+        self.hint_service.request(self.board.position.bits, self.board.from_start)
+        self.hint_pending = True
+
+    def _cancel_hint(self) -> None:
+        """Позиція змінилась – відповідь на старий запит уже не потрібна."""
+        self.hint_service.cancel()
+        self.hint_pending = False
+
+    def _on_hint_ready(self, event) -> None:
+        # застарілі відповіді (позиція вже інша) просто відкидаємо
+        if event.request != self.hint_service.latest or event.bits != self.board.position.bits:
+            return
+        self.hint_pending = False
+        if self.state == STATE_PLAYING:
+            self.board.show_hint(event.jump)
+
     # --- події --- #
 
-    def _handle_events(self) -> None:
-        for event in pygame.event.get():
+    def _handle_events(self, events: list) -> None:
+        for event in events:
+            if event.type in INPUT_EVENTS:
+                self.last_input_time = pygame.time.get_ticks()
+
             if event.type == pygame.QUIT:
                 self.running = False
 
+            elif event.type == AUTO_HINT_EVENT:
+                if self.state == STATE_PLAYING and self.board.selected_peg is None:
+                    self._request_hint()
+
+            elif event.type == HINT_READY_EVENT:
+                self._on_hint_ready(event)
+
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # вікно перекрили / відновили – вміст екрана втрачено
+                self.renderer.invalidate()
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
@@ -66,9 +179,13 @@ class Game:
                     self._restart()
                 elif event.key == pygame.K_z and (pygame.key.get_mods() & pygame.KMOD_CTRL):
                     self._undo()
-                elif event.key == pygame.K_h:
+                elif event.key == pygame.K_y and (pygame.key.get_mods() & pygame.KMOD_CTRL):
+                    self._redo()
+                elif event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+                elif event.key == pygame.K_h and self.state == STATE_PLAYING:
                     # ручний виклик підказки
-                    self.board._show_best_hint()
+                    self._request_hint()
 
             # спершу UI (кнопки)
             if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
@@ -83,9 +200,14 @@ class Game:
                 and event.button == 1
                 and self.state == STATE_PLAYING
             ):
+                # будь-який клік по дошці скидає таймер автопідказки
+                if self.board.board_pos_from_pixel(event.pos) is not None:
+                    self._schedule_auto_hint()
+                    self._cancel_hint()
                 move_made = self.board.handle_click(event.pos)
                 if move_made:
                     self._check_game_over()
+                    self._autosave()
 
     def _handle_ui_action(self, action: dict) -> None:
         btn = action.get("button")
@@ -98,14 +220,39 @@ class Game:
 
     # --- ігрова логіка --- #
 
+    def _new_board(self) -> Board:
+        if self.puzzle is None:
+            return Board()
+        board = Board(self.puzzle.geometry)
+        board.load_puzzle(self.puzzle)
+        return board
+
     def _restart(self) -> None:
         print("=== RESTART ===")
-        self.board = Board()
+        self.board = self._new_board()
         self.state = STATE_PLAYING
+        self._cancel_hint()
+        self._schedule_auto_hint()
+        self._autosave()
 
     def _undo(self) -> None:
         if self.board.undo_move():
             self.state = STATE_PLAYING
+            self._cancel_hint()
+            self._schedule_auto_hint()
+            self._autosave()
+
+    def _redo(self) -> None:
+        if self.state == STATE_PLAYING and self.board.redo_move():
+            self._cancel_hint()
+            self._schedule_auto_hint()
+            self._check_game_over()
+            self._autosave()
+
+    def _autosave(self) -> None:
+        # кодування – мікросекунди; запис на диск – у фоновому потоці
+        if self.autosaver is not None:
+            self.autosaver.submit(encode_session(self.board))
 
     def _check_game_over(self) -> None:
         if not self.board.has_valid_moves():
@@ -117,32 +264,74 @@ class Game:
         can_undo = len(self.board.move_history) > 0
         self.ui.update_button_states(self.state, can_undo)
 
-        if self.state == STATE_PLAYING:
-            self.board.update_hints()
-
     # --- малювання --- #
 
     def _draw(self) -> None:
+        self.assets.sync(self.screen)
+        self.renderer.render(self._frame_regions())
+
+    def _draw_static(self, surface: pygame.Surface) -> None:
         # легкий теплий фон
-        self.screen.fill((253, 241, 219))
+        surface.fill((253, 241, 219))
+        self.board.draw_static(surface, self.assets)
 
-        self.board.draw(self.screen, self.images)
-        self.ui.draw(self.screen, self.images)
+    def _draw_dynamic(self, surface: pygame.Surface) -> None:
+        phase = self.profiler.phase
+        with phase("draw.board"):
+            self.board.draw_dynamic(surface, self.assets)
+        with phase("draw.ui"):
+            self.ui.draw(surface, self.assets)
 
-        self._draw_hud()
+        with phase("draw.hud"):
+            self._draw_hud()
+
+            if self.state == STATE_PLAYING:
+                self._draw_lost_warning()
 
         if self.state == STATE_GAME_OVER:
             self._draw_game_over_overlay()
 
-        pygame.display.flip()
+        if self.show_profiler:
+            self.profiler.draw_overlay(surface, self.font_profiler)
+
+    def _frame_regions(self) -> dict:
+        """Області екрана та їхній стан для рендерера."""
+        regions = {}
+        for cell, state in self.board.render_states().items():
+            regions[("cell", cell)] = (self.board.cell_rect(*cell), state)
+
+        for key, button in self.ui.buttons.items():
+            regions[("button", key)] = (
+                button.rect.inflate(4, 4),
+                (button.visible, button.state),
+            )
+
+        regions["hud"] = (
+            pygame.Rect(HUD_RECT),
+            (self.board.get_peg_count(), len(self.board.move_history)),
+        )
+        regions["hint_label"] = (pygame.Rect(HINT_LABEL_RECT), self.hint_pending)
+        if self.state == STATE_PLAYING:
+            regions["lost_label"] = (pygame.Rect(LOST_LABEL_RECT), self._lost_warning())
+
+        if self.state == STATE_GAME_OVER:
+            regions["overlay"] = (
+                self.screen.get_rect(),
+                (self.board.get_peg_count(), self.board.is_won()),
+            )
+        if self.show_profiler:
+            # графік оновлюється щокадру
+            regions["profiler"] = (pygame.Rect(PROFILER_RECT), self.profiler.frame_count)
+        return regions
 
     def _draw_hud(self) -> None:
         pegs = self.board.get_peg_count()
         moves = len(self.board.move_history)
 
-        text1 = self.font_main.render(f"Фішки: {pegs}", True, BLACK)
-        text2 = self.font_main.render(f"Ходи: {moves}", True, BLACK)
-        hint_text = self.font_small.render("H – підказка", True, BLACK)
+        text1 = render_text(self.font_main, f"Фішки: {pegs}", BLACK)
+        text2 = render_text(self.font_main, f"Ходи: {moves}", BLACK)
+        label = "Думаю над підказкою…" if self.hint_pending else "H – підказка"
+        hint_text = render_text(self.font_small, label, BLACK)
 
         # Лічильники зверху зліва
         self.screen.blit(text1, (20, 20))
@@ -152,37 +341,105 @@ class Game:
         hint_rect.bottomleft = (20, SCREEN_HEIGHT - 15)
         self.screen.blit(hint_text, hint_rect)
 
+    def _lost_warning(self) -> str | None:
+        """Попередження ще до кінця партії, якщо програш уже доведено."""
+        if self.board.is_lost():
+            if self.board.goal is not None:
+                return "У цілі задачі вже не закінчити"
+            return "Одну фішку вже не залишити"
+        if self.board.goal is None and self.board.is_lost(to_center=True):
+            return "У центрі вже не закінчити"
+        return None
+
+    def _draw_lost_warning(self) -> None:
+        warning = self._lost_warning()
+        if warning is None:
+            return
+        surf = render_text(self.font_warning, warning, RED)
+        rect = surf.get_rect(topright=(SCREEN_WIDTH - 20, 20))
+        self.screen.blit(surf, rect)
+
     def _draw_game_over_overlay(self) -> None:
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 140))
-        self.screen.blit(overlay, (0, 0))
+        if self._overlay_dim is None:
+            self._overlay_dim = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            self._overlay_dim.fill((0, 0, 0, 140))
+        self.screen.blit(self._overlay_dim, (0, 0))
+
+        key = (
+            self.state,
+            self.board.get_peg_count(),
+            len(self.board.move_history),
+            self.board.is_won(),
+        )
+        if key != self._overlay_key:
+            self._overlay_key = key
+            self._overlay_texts = self._build_overlay_texts(key[1], key[3])
+        for surf, rect in self._overlay_texts:
+            self.screen.blit(surf, rect)
 
-        pegs_left = self.board.get_peg_count()
+    def _build_overlay_texts(self, pegs_left: int, won: bool) -> list[tuple[pygame.Surface, pygame.Rect]]:
         msg = f"Гра завершена. Залишилось фішок: {pegs_left}"
 
-        if pegs_left == 1:
+        if won:
             score = "Ідеально! 🎉"
+        elif pegs_left == 1:
+            score = "Одна фішка, але не в цілі 🙂"
         elif pegs_left <= 3:
             score = "Дуже добре! 👍"
         else:
             score = "Спробуй ще раз 🙂"
 
-        msg_surf = self.font_main.render(msg, True, WHITE)
-        score_surf = self.font_main.render(score, True, WHITE)
-        info_surf = self.font_small.render(
+        msg_surf = render_text(self.font_main, msg, WHITE)
+        score_surf = render_text(self.font_main, score, WHITE)
+        info_surf = render_text(
+            self.font_small,
             "Натисни R або кнопку Restart, щоб почати ще раз",
-            True,
             WHITE,
         )
 
-        msg_rect = msg_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
-        score_rect = score_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
-        info_rect = info_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
-
-        self.screen.blit(msg_surf, msg_rect)
-        self.screen.blit(score_surf, score_rect)
-        self.screen.blit(info_surf, info_rect)
+        return [
+            (msg_surf, msg_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))),
+            (score_surf, score_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))),
+            (info_surf, info_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))),
+        ]
 
 
 if __name__ == "__main__":
-    Game().run()
+    parser = argparse.ArgumentParser(description="Peg Solitaire")
+    parser.add_argument(
+        "--no-assets",
+        action="store_true",
+        help="не вантажити текстури, малювати векторні заглушки",
+    )
+    parser.add_argument(
+        "--profile-export",
+        metavar="PATH|udp://HOST:PORT",
+        help="періодично експортувати p50/p95/p99 фаз кадру",
+    )
+    parser.add_argument(
+        "--puzzles",
+        metavar="PATH",
+        help="грати задачу з файлу python -m game.puzzles замість стандартного старту",
+    )
+    parser.add_argument(
+        "--puzzle-index",
+        type=int,
+        help="номер задачі у файлі (за замовчуванням – задача дня)",
+    )
+    args = parser.parse_args()
+
+    puzzle = None
+    if args.puzzles:
+        puzzles = load_puzzles(args.puzzles)
+        if not puzzles:
+            sys.exit(f"У файлі {args.puzzles} немає задач")
+        index = args.puzzle_index
+        if index is None:
+            index = datetime.date.today().toordinal() % len(puzzles)
+        puzzle = puzzles[index % len(puzzles)]
+
+    Game(
+        load_assets=not args.no_assets,
+        profile_export=args.profile_export,
+        puzzle=puzzle,
+    ).run()
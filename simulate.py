@@ -0,0 +1,112 @@
+"""
+Безголова пакетна симуляція: N партій без pygame і без вікна.
+
+    python simulate.py --games 100000 --policy center --workers 8 --output stats.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+from game.policies import POLICIES
+from game.geometries import DEFAULT_GEOMETRY
+from game.position import Position
+
+# політика створюється один раз на процес-воркер
+_policy = None
+
+
+def _init_worker(policy_name: str) -> None:
+    global _policy
+    _policy = POLICIES[policy_name](DEFAULT_GEOMETRY)
+
+
+def play_game(policy, rng: random.Random, geometry=DEFAULT_GEOMETRY) -> tuple[int, int]:
+    """Зіграти одну партію від старту. Повертає (фішок залишилось, ходів)."""
+    position = Position.start(geometry)
+    moves = 0
+    while position.moves:
+        position.apply(policy(position, rng))
+        moves += 1
+    return position.peg_count(), moves
+
+
+def _play_chunk(args: tuple[int, int]) -> tuple[Counter, int]:
+    games, seed = args
+    rng = random.Random(seed)
+    pegs_left: Counter = Counter()
+    total_moves = 0
+    for _ in range(games):
+        pegs, moves = play_game(_policy, rng)
+        pegs_left[pegs] += 1
+        total_moves += moves
+    return pegs_left, total_moves
+
+
+def simulate(
+    games: int,
+    policy: str = "center",
+    workers: int | None = None,
+    seed: int = 0,
+    chunk_size: int = 1000,
+) -> dict:
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        (min(chunk_size, games - start), seed + i)
+        for i, start in enumerate(range(0, games, chunk_size))
+    ]
+
+    pegs_left: Counter = Counter()
+    total_moves = 0
+    started = time.perf_counter()
+
+    if workers == 1:
+        _init_worker(policy)
+        results = map(_play_chunk, chunks)
+        for chunk_pegs, chunk_moves in results:
+            pegs_left.update(chunk_pegs)
+            total_moves += chunk_moves
+    else:
+        with multiprocessing.Pool(workers, _init_worker, (policy,)) as pool:
+            for chunk_pegs, chunk_moves in pool.imap_unordered(_play_chunk, chunks):
+                pegs_left.update(chunk_pegs)
+                total_moves += chunk_moves
+
+    elapsed = time.perf_counter() - started
+    return {
+        "policy": policy,
+        "games": games,
+        "workers": workers,
+        "seed": seed,
+        "elapsed_sec": round(elapsed, 3),
+        "games_per_sec": round(games / elapsed, 1) if elapsed else None,
+        "moves_per_sec": round(total_moves / elapsed, 1) if elapsed else None,
+        "mean_pegs_left": round(sum(k * v for k, v in pegs_left.items()) / games, 3) if games else None,
+        "pegs_left": {str(k): pegs_left[k] for k in sorted(pegs_left)},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Пакетна симуляція партій без вікна")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="center")
+    parser.add_argument("--workers", type=int, default=None, help="за замовчуванням – усі ядра")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="куди записати JSON зі статистикою")
+    args = parser.parse_args(argv)
+
+    stats = simulate(args.games, args.policy, args.workers, args.seed)
+
+    text = json.dumps(stats, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()